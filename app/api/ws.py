@@ -1,261 +1,308 @@
 import asyncio
+import gzip
+import hashlib
+import logging
 import os
-from typing import Any, Dict
+import struct
+import types
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
 
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from starlette.websockets import WebSocketState
 
-from app.archivist.impl_jsonl import JsonlArchivist
 from app.config import settings
 from app.errors import VimaniError
-from app.executor.impl_mock import MockExecutor
 from app.orchestrator.models import ErrorEnvelope, ErrorSeverity, ErrorSource
 from app.orchestrator.service import OrchestratorService
 from app.planner.impl_llm import LLMPlanner
-from app.planner.impl_mock import MockPlanner
+from app.serialization import orjson_default
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip is always served
+    brotli = None
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Read once at import; app.config (imported above) has loaded .env.
+PLANNER_MODE = (os.getenv("VIMANI_PLANNER") or "").strip().lower()
+HAS_API_KEY = bool(os.getenv("OPENAI_API_KEY"))
+
+_EMPTY_DICT = types.MappingProxyType({})
+
+# Keepalive: a client that cannot take a PING within the timeout is treated as dead.
+_PING_INTERVAL_S = 15.0
+_PING_TIMEOUT_S = 5.0
+_PING_FRAME = '{"type":"PING"}'
+
+# Step events that set a step's rendered status; within one batch only the
+# latest of these per step needs to reach the client.
+_STATUS_EVENT_TYPES = frozenset({"STEP_STARTED", "STEP_DONE", "STEP_FAILED"})
+
+
+def _status_key(payload: Dict[str, Any]) -> Tuple[Any, Any] | None:
+    if type(payload) is not dict or payload.get("type") != "EXEC_EVENT":
+        return None
+    event = payload.get("event") or {}
+    if event.get("type") not in _STATUS_EVENT_TYPES:
+        return None
+    return payload.get("run_id"), event.get("step_id")
+
+
+def _drop_oldest_superseded(queue: asyncio.Queue) -> bool:
+    """Remove the oldest queued STEP_STARTED that a later queued status event
+    for the same step replaces; return False if there is none.
+
+    STEP_DONE and STEP_FAILED are never dropped: they are the client's only
+    word that a step finished. EXEC_EVENT_BATCH items are never dropped
+    either, as they usually end in one; their events can still supersede
+    earlier queued ones.
+    """
+    pending = queue._queue  # type: ignore[attr-defined]
+    later: set = set()
+    oldest = None
+    for idx in range(len(pending) - 1, -1, -1):
+        item = pending[idx]
+        if type(item) is dict and item.get("type") == "EXEC_EVENT_BATCH":
+            later.update(key for event in item.get("events") or () if (key := _status_key(event)) is not None)
+            continue
+        key = _status_key(item)
+        if key is None:
+            continue
+        if key in later and item["event"]["type"] == "STEP_STARTED":
+            oldest = idx
+        later.add(key)
+    if oldest is None:
+        return False
+    del pending[oldest]
+    return True
+
+
+def _flatten_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Expand EXEC_EVENT_BATCH items into their EXEC_EVENT payloads, in order."""
+    flat: List[Dict[str, Any]] = []
+    for payload in batch:
+        if type(payload) is dict and payload.get("type") == "EXEC_EVENT_BATCH":
+            flat.extend(payload.get("events") or ())
+        else:
+            flat.append(payload)
+    return flat
+
+
+def _coalesce_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop step-status events superseded later in the same batch, preserving order."""
+    latest: Dict[Tuple[Any, Any], int] = {}
+    keyed = 0
+    for idx, payload in enumerate(batch):
+        key = _status_key(payload)
+        if key is not None:
+            latest[key] = idx
+            keyed += 1
+    if keyed == len(latest):
+        return batch
+    return [
+        payload
+        for idx, payload in enumerate(batch)
+        if (key := _status_key(payload)) is None or latest[key] == idx
+    ]
+
+
+# Step events travel as compact binary frames: a tag byte and uint16 record
+# count, then per event its tag, uint16 step index and a uint32-length JSON
+# object holding whichever of message/output/error it carries (empty if
+# none). The index is the step's position in the accepted plan, which the
+# client already holds.
+_BINARY_EXEC_TAG = 0x01
+_BINARY_HEADER = struct.Struct("<BH")
+_BINARY_RECORD = struct.Struct("<BHI")
+_BINARY_DETAIL_FIELDS = ("message", "output", "error")
+_BINARY_EVENT_TAGS = {
+    "STEP_STARTED": 1,
+    "STEP_LOG": 2,
+    "STEP_DONE": 3,
+    "STEP_FAILED": 4,
+}
+
+
+def _index_plan(step_index: Dict[Any, Dict[str, int]], payload: Dict[str, Any]) -> None:
+    """Record step positions for a PLAN_ACCEPTED payload; one run per connection."""
+    plan = payload.get("plan")
+    steps = plan.get("steps") if isinstance(plan, dict) else None
+    step_index.clear()
+    if not steps or len(steps) > 0xFFFF:
+        return
+    step_index[payload.get("run_id")] = {
+        step.get("step_id") or f"step_{idx + 1}": idx for idx, step in enumerate(steps)
+    }
+
+
+def _binary_record(payload: Dict[str, Any], step_index: Dict[Any, Dict[str, int]]) -> bytes | None:
+    if type(payload) is not dict or payload.get("type") != "EXEC_EVENT":
+        return None
+    steps = step_index.get(payload.get("run_id"))
+    if steps is None:
+        return None
+    event = payload.get("event") or {}
+    tag = _BINARY_EVENT_TAGS.get(event.get("type"))
+    idx = steps.get(event.get("step_id"))
+    if tag is None or idx is None:
+        return None
+    details = {field: event[field] for field in _BINARY_DETAIL_FIELDS if event.get(field) is not None}
+    body = orjson.dumps(details, default=orjson_default) if details else b""
+    return _BINARY_RECORD.pack(tag, idx, len(body)) + body
+
+
+def _encode_batch(
+    batch: List[Dict[str, Any]], step_index: Dict[Any, Dict[str, int]]
+) -> List[str | bytes]:
+    """Split a batch into frames, in order: runs of step events are packed
+    into one binary frame, everything else goes out as JSON text."""
+    frames: List[str | bytes] = []
+    records: List[bytes] = []
+    pending: List[Dict[str, Any]] = []
+    for payload in batch:
+        if type(payload) is dict and payload.get("type") == "PLAN_ACCEPTED":
+            _index_plan(step_index, payload)
+        record = _binary_record(payload, step_index)
+        if record is None:
+            if records:
+                frames.append(_BINARY_HEADER.pack(_BINARY_EXEC_TAG, len(records)) + b"".join(records))
+                records = []
+            pending.append(payload)
+        else:
+            if pending:
+                frames.append(_encode_events(pending))
+                pending = []
+            records.append(record)
+    if records:
+        frames.append(_BINARY_HEADER.pack(_BINARY_EXEC_TAG, len(records)) + b"".join(records))
+    if pending:
+        frames.append(_encode_events(pending))
+    return frames
+
+
+def _encode(payload: Any) -> str:
+    """Encode a payload as a JSON text frame."""
+    return orjson.dumps(payload, default=orjson_default).decode()
+
+
+def _encode_events(events: List[Dict[str, Any]]) -> str:
+    if len(events) == 1:
+        return _encode(events[0])
+    return _encode({"type": "BATCH", "events": events})
+
+
+# Defaults shared by every envelope raised from this endpoint; each error is
+# a shallow copy with its own fields filled in, skipping pydantic validation.
+_ERROR_ENVELOPE_TEMPLATE = ErrorEnvelope.model_construct(
+    code="",
+    message="",
+    source=ErrorSource.ORCHESTRATOR,
+    severity=ErrorSeverity.RUN,
+    step_id=None,
+    retryable=False,
+)
+
+
+def _make_error_envelope(
+    code: str,
+    message: str,
+    *,
+    source: ErrorSource = ErrorSource.ORCHESTRATOR,
+    severity: ErrorSeverity = ErrorSeverity.RUN,
+    step_id: str | None = None,
+    retryable: bool = False,
+) -> ErrorEnvelope:
+    return _ERROR_ENVELOPE_TEMPLATE.model_copy(
+        update={
+            "code": code,
+            "message": message,
+            "source": source,
+            "severity": severity,
+            "step_id": step_id,
+            "retryable": retryable,
+        }
+    )
 
-@router.get("/test", response_class=HTMLResponse)
-async def test_page(request: Request) -> str:
-    return """
+
+# Frames whose content is fixed once the module is loaded are encoded here and
+# queued as orjson fragments, which the writer splices in without re-encoding.
+# Queue items are therefore payload dicts or fragments.
+def _preencoded(payload: Dict[str, Any]) -> orjson.Fragment:
+    return orjson.Fragment(orjson.dumps(payload, default=orjson_default))
+
+
+_START_RUN_DEBUG = _preencoded(
+    {
+        "type": "DEBUG",
+        "message": (
+            f"START_RUN: OPENAI_API_KEY present={HAS_API_KEY}, "
+            f"planner={'LLM' if PLANNER_MODE == 'llm' else 'Mock'}"
+        ),
+    }
+)
+_LLM_PLANNER_DEBUG = _preencoded({"type": "DEBUG", "message": f"planner=LLMPlanner model={settings.planner_model}"})
+_MOCK_PLANNER_DEBUG = _preencoded({"type": "DEBUG", "message": "planner=MockPlanner"})
+
+
+def _run_error_json(envelope: ErrorEnvelope | Dict[str, Any]) -> bytes:
+    """Encode a RUN_ERROR payload, serializing the envelope exactly once."""
+    if hasattr(envelope, "model_dump_json"):
+        body = envelope.model_dump_json().encode()
+    else:
+        body = orjson.dumps(envelope)
+    return b'{"type":"RUN_ERROR","error":' + body + b"}"
+
+
+async def _send_error(websocket: WebSocket, frame: bytes) -> None:
+    """Send an encoded RUN_ERROR directly, bypassing the writer; a closed socket is ignored."""
+    try:
+        await websocket.send_text(frame.decode())
+    except (WebSocketDisconnect, RuntimeError, OSError):
+        pass
+
+
+_UNKNOWN_MESSAGE_ERROR = orjson.Fragment(
+    _run_error_json(_make_error_envelope(code="UNKNOWN_MESSAGE", message="Unknown message type"))
+)
+
+
+def _error_template(code: str) -> Tuple[bytes, bytes]:
+    """Split a pre-encoded RUN_ERROR for ``code`` around its message value."""
+    marker = "\x00"
+    head, tail = _run_error_json(_make_error_envelope(code=code, message=marker)).split(orjson.dumps(marker))
+    return head, tail
+
+
+def _templated_error(template: Tuple[bytes, bytes], message: str) -> bytes:
+    return template[0] + orjson.dumps(message) + template[1]
+
+
+_PLANNER_INIT_FAILED = _error_template("PLANNER_INIT_FAILED")
+_WS_FAILURE = _error_template("WS_FAILURE")
+
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+
+
+def _asset_url(name: str) -> str:
+    """Return a content-versioned URL so the asset can be cached as immutable."""
+    digest = hashlib.md5((STATIC_DIR / name).read_bytes()).hexdigest()[:12]
+    return f"/static/{name}?v={digest}"
+
+
+_TEST_HTML = """
 <!DOCTYPE html>
 <html lang="en">
   <head>
     <meta charset="utf-8" />
     <title>Vimani Agent Demo</title>
-    <style>
-      :root {
-        color-scheme: dark;
-        font-family: "Inter", -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
-      }
-      * {
-        box-sizing: border-box;
-      }
-      body {
-        margin: 0;
-        background: #050910;
-        color: #f5f7fb;
-        min-height: 100vh;
-        padding: 24px;
-      }
-      h1,
-      h2,
-      h3,
-      h4 {
-        margin: 0 0 12px;
-        font-weight: 600;
-      }
-      .app {
-        max-width: 1200px;
-        margin: 0 auto;
-        display: grid;
-        grid-template-columns: 1fr 360px;
-        gap: 24px;
-      }
-      .card {
-        background: #0f1726;
-        border-radius: 16px;
-        padding: 20px;
-        box-shadow: 0 10px 40px rgba(0, 0, 0, 0.35);
-      }
-      .card h3 {
-        font-size: 1.1rem;
-        letter-spacing: 0.01em;
-      }
-      .left-column {
-        display: flex;
-        flex-direction: column;
-        gap: 16px;
-      }
-      .chat-header {
-        display: flex;
-        flex-direction: column;
-        gap: 12px;
-        margin-bottom: 12px;
-      }
-      .control-row {
-        display: flex;
-        gap: 12px;
-      }
-      label {
-        font-size: 0.85rem;
-        opacity: 0.8;
-        display: flex;
-        flex-direction: column;
-        gap: 6px;
-        flex: 1;
-      }
-      input,
-      textarea {
-        border: 1px solid rgba(255, 255, 255, 0.15);
-        background: rgba(255, 255, 255, 0.04);
-        color: #f5f7fb;
-        border-radius: 10px;
-        padding: 10px 12px;
-        font-size: 0.95rem;
-        width: 100%;
-      }
-      textarea {
-        min-height: 80px;
-        resize: vertical;
-      }
-      button {
-        border: none;
-        border-radius: 10px;
-        padding: 10px 16px;
-        font-weight: 600;
-        cursor: pointer;
-        transition: opacity 0.2s ease;
-      }
-      button:disabled {
-        opacity: 0.4;
-        cursor: not-allowed;
-      }
-      .primary {
-        background: linear-gradient(135deg, #66d1ff, #7c5dff);
-        color: #050910;
-      }
-      .ghost {
-        background: rgba(255, 255, 255, 0.08);
-        color: #f5f7fb;
-      }
-      .chat-window {
-        background: rgba(5, 9, 16, 0.5);
-        border-radius: 18px;
-        padding: 16px;
-        min-height: 520px;
-        max-height: 520px;
-        overflow: hidden;
-        display: flex;
-        flex-direction: column;
-      }
-      .chat-messages {
-        flex: 1;
-        overflow-y: auto;
-        padding-right: 8px;
-        display: flex;
-        flex-direction: column;
-        gap: 12px;
-      }
-      .bubble {
-        max-width: 82%;
-        padding: 12px 16px;
-        border-radius: 16px;
-        font-size: 0.95rem;
-        line-height: 1.4;
-        white-space: pre-wrap;
-      }
-      .bubble.assistant {
-        align-self: flex-start;
-        background: rgba(102, 209, 255, 0.15);
-        border-bottom-left-radius: 4px;
-      }
-      .bubble.user {
-        align-self: flex-end;
-        background: rgba(124, 93, 255, 0.4);
-        border-bottom-right-radius: 4px;
-      }
-      .composer {
-        margin-top: 16px;
-        display: flex;
-        gap: 12px;
-      }
-      .composer textarea {
-        flex: 1;
-        min-height: 60px;
-        max-height: 120px;
-      }
-      .planner-form {
-        margin-top: 12px;
-        padding: 14px;
-        border-radius: 12px;
-        background: rgba(255, 255, 255, 0.05);
-        display: flex;
-        flex-direction: column;
-        gap: 10px;
-      }
-      .right-column {
-        display: flex;
-        flex-direction: column;
-        gap: 16px;
-      }
-      .progress-list {
-        list-style: none;
-        margin: 0;
-        padding: 0;
-        display: flex;
-        flex-direction: column;
-        gap: 10px;
-        max-height: 260px;
-        overflow-y: auto;
-      }
-      .progress-item {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        padding: 10px 12px;
-        border-radius: 12px;
-        background: rgba(255, 255, 255, 0.04);
-        font-size: 0.9rem;
-      }
-      .progress-item .meta {
-        opacity: 0.6;
-        font-size: 0.8rem;
-      }
-      .status-icon {
-        margin-right: 8px;
-        font-size: 1.1rem;
-      }
-      .decision-panel {
-        display: flex;
-        flex-direction: column;
-        gap: 12px;
-      }
-      .decision-buttons {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 8px;
-      }
-      .badge {
-        display: inline-flex;
-        align-items: center;
-        gap: 6px;
-        padding: 6px 10px;
-        border-radius: 999px;
-        background: rgba(255, 255, 255, 0.08);
-        font-size: 0.8rem;
-      }
-      .event-log {
-        font-family: "JetBrains Mono", "SFMono-Regular", Consolas, monospace;
-        font-size: 0.8rem;
-        max-height: 160px;
-        overflow-y: auto;
-        background: rgba(0, 0, 0, 0.35);
-        padding: 12px;
-        border-radius: 12px;
-        line-height: 1.5;
-      }
-      .hidden {
-        display: none !important;
-      }
-      .result-card {
-        display: flex;
-        flex-direction: column;
-        gap: 8px;
-      }
-      .result-card span {
-        opacity: 0.85;
-        font-size: 0.9rem;
-      }
-      @media (max-width: 960px) {
-        .app {
-          grid-template-columns: 1fr;
-        }
-      }
-    </style>
+    <link rel="stylesheet" href="{css_url}" />
   </head>
   <body>
     <div class="app">
@@ -324,684 +371,266 @@ async def test_page(request: Request) -> str:
         </div>
       </section>
     </div>
-    <script>
-      (() => {
-        const wsProtocol = window.location.protocol === "https:" ? "wss" : "ws";
-        const wsUrl = `${wsProtocol}://${window.location.host}/ws`;
-
-        const state = {
-          ws: null,
-          runId: null,
-          phase: "IDLE",
-          messages: [],
-          execEvents: [],
-          steps: {},
-          stepOrder: [],
-          paused: null,
-          final: null,
-        };
-
-        const elements = {
-          startCard: document.getElementById("start-card"),
-          intent: document.getElementById("intent-input"),
-          failStep: document.getElementById("fail-step-input"),
-          startBtn: document.getElementById("start-btn"),
-          chatMessages: document.getElementById("chat-messages"),
-          composer: document.getElementById("composer"),
-          userInput: document.getElementById("user-input"),
-          sendBtn: document.getElementById("send-btn"),
-          plannerForm: document.getElementById("planner-form"),
-          plannerHide: document.getElementById("planner-hide-btn"),
-          plannerSubmit: document.getElementById("planner-submit"),
-          plannerFields: document.getElementById("planner-fields"),
-          progressList: document.getElementById("progress-list"),
-          decisionCard: document.getElementById("decision-card"),
-          decisionButtons: document.querySelectorAll("#decision-card button[data-decision]"),
-          eventLog: document.getElementById("event-log"),
-          resultCard: document.getElementById("result-card"),
-          resultSummary: document.getElementById("result-summary"),
-          resultArchive: document.getElementById("result-archive"),
-        };
-
-        const statusIcons = {
-          PENDING: "…",
-          RUNNING: "⏳",
-          DONE: "✅",
-          FAILED: "❌",
-          PAUSED: "⏸",
-          SKIPPED: "⏭",
-        };
-
-        const logLines = [];
-
-        function appendLog(line) {
-          const timestamp = new Date().toLocaleTimeString();
-          logLines.push(`[${timestamp}] ${line}`);
-          while (logLines.length > 40) logLines.shift();
-          elements.eventLog.textContent = logLines.join("\\n");
-          elements.eventLog.scrollTop = elements.eventLog.scrollHeight;
-        }
-
-        function togglePlannerForm(visible) {
-          elements.plannerForm.classList.toggle("hidden", !visible);
-        }
-
-        function toggleComposer(visible) {
-          elements.composer.classList.toggle("hidden", !visible);
-        }
-
-        function renderChat() {
-          const container = elements.chatMessages;
-          container.innerHTML = "";
-          state.messages.forEach((msg) => {
-            const bubble = document.createElement("div");
-            bubble.className = `bubble ${msg.role === "user" ? "user" : "assistant"}`;
-            bubble.textContent = msg.text;
-            container.appendChild(bubble);
-          });
-          container.scrollTop = container.scrollHeight;
-          const shouldShowComposer =
-            Boolean(state.runId) &&
-            state.phase === "PLANNING" &&
-            elements.plannerForm.classList.contains("hidden");
-
-          toggleComposer(shouldShowComposer);
-
-          elements.startCard.classList.toggle("hidden", Boolean(state.runId));
-        }
-
-        function renderSteps() {
-          const list = elements.progressList;
-          list.innerHTML = "";
-          if (!state.stepOrder.length) {
-            const li = document.createElement("li");
-            li.className = "progress-item";
-            li.style.justifyContent = "center";
-            li.style.opacity = "0.65";
-            li.textContent = "Awaiting plan...";
-            list.appendChild(li);
-            return;
-          }
-          state.stepOrder
-            .map((id) => state.steps[id])
-            .filter(Boolean)
-            .sort((a, b) => a.order - b.order)
-            .forEach((step) => {
-              const li = document.createElement("li");
-              li.className = "progress-item";
-              const icon = document.createElement("span");
-              icon.className = "status-icon";
-              icon.textContent = statusIcons[step.status] || "…";
-              const info = document.createElement("div");
-              info.style.flex = "1";
-              info.innerHTML = `<strong>${step.id}</strong><div class="meta">${step.op}</div>`;
-              li.appendChild(icon);
-              li.appendChild(info);
-              list.appendChild(li);
-            });
-        }
-
-                 
-
-        function renderDecision() {
-          if (!state.paused) {
-            elements.decisionCard.classList.add("hidden");
-           return;
-          }
-
-          elements.decisionCard.classList.remove("hidden");
-
-          const error = state.paused.error;
-          if (error?.message) {
-            appendLog(`Paused: ${error.message}`);
-          }
-        }
-
-        function renderFinal() {
-          if (state.final) {
-            elements.resultCard.classList.remove("hidden");
-            const status = state.final.status || "SUCCESS";
-            const summary = state.final.summary || "Run completed.";
-            elements.resultSummary.textContent = `${summary} (status: ${status})`;
-            elements.resultArchive.textContent = state.final.archive_ref
-              ? `Run archived ✅  archive_ref: ${state.final.archive_ref}`
-              : "Run archived ✅";
-          } else {
-            elements.resultCard.classList.add("hidden");
-          }
-        }
-
-        function render() {
-          renderChat();
-          renderSteps();
-          renderDecision();
-          renderFinal();
-        }
-
-        function addMessage(role, text) {
-          if (!text) return;
-          state.messages.push({ role, text });
-          render();
-        }
-
-        function setPlanSteps(plan) {
-          if (!plan || !Array.isArray(plan.steps)) return;
-          state.steps = {};
-          state.stepOrder = [];
-          plan.steps.forEach((step, index) => {
-            const id = step.step_id || `step_${index + 1}`;
-            state.stepOrder.push(id);
-            state.steps[id] = {
-              id,
-              op: step.op_id || "operation",
-              status: "PENDING",
-              dependsOn: Array.isArray(step.depends_on) ? step.depends_on : [],
-              order: index,
-            };
-          });
-          render();
-        }
-
-        function updateStepStatus(stepId, status) {
-          if (!state.steps[stepId]) return;
-          state.steps[stepId].status = status;
-          render();
-        }
-
-        function markDependentsSkipped(stepId) {
-          Object.values(state.steps).forEach((step) => {
-            if (step.dependsOn.includes(stepId)) {
-              step.status = "SKIPPED";
-            }
-          });
-          render();
-        }
-
-        function normalizeMessageText(msg) {
-          if (!msg) return "";
-          return (
-            msg.text ||
-            msg.message ||
-            (typeof msg === "string" ? msg : JSON.stringify(msg, null, 2))
-          );
-        }
-
-        function normalizeExecEvent(msg) {
-          if (!msg) return null;
-          if (msg.event && msg.event.type) return msg.event;
-          if (msg.event && msg.event.event) return msg.event.event;
-          if (msg.type && msg.step_id !== undefined) return msg;
-          return msg.event || msg;
-        }
-
-        function renderPlannerForm(message) {
-          const container = elements.plannerFields;
-          if (!container) return;
-          container.innerHTML = "";
-
-          const fields = Array.isArray(message.fields) ? message.fields : [];
-
-          fields.forEach((field) => {
-            if (!field || !field.key) return;
-
-            const wrapper = document.createElement("label");
-            wrapper.dataset.key = field.key;
-            wrapper.style.display = "flex";
-            wrapper.style.flexDirection = "column";
-            wrapper.style.gap = "6px";
-
-            const labelEl = document.createElement("span");
-            const requiredMark = field.required ? " *" : "";
-            labelEl.textContent = `${field.label || field.key}${requiredMark}`;
-            wrapper.appendChild(labelEl);
-
-            const fieldType = (field.type || "text").toLowerCase();
-            let inputEl;
-
-            if (fieldType === "textarea") {
-              inputEl = document.createElement("textarea");
-            } else if (fieldType === "select") {
-              inputEl = document.createElement("select");
-              const options = Array.isArray(field.options) ? field.options : [];
-              options.forEach((opt) => {
-                const optionEl = document.createElement("option");
-                let value;
-                let label;
-                if (typeof opt === "string") {
-                  value = opt;
-                  label = opt;
-                } else {
-                  value = opt.value ?? opt.id ?? opt.label ?? "";
-                  label = opt.label ?? String(value);
-                }
-                optionEl.value = value;
-                optionEl.textContent = label;
-                inputEl.appendChild(optionEl);
-              });
-            } else {
-              inputEl = document.createElement("input");
-              inputEl.type = fieldType === "number" ? "number" : "text";
-            }
-
-            inputEl.name = field.key;
-            if (field.placeholder) {
-              inputEl.placeholder = field.placeholder;
-            }
-            if (field.required) {
-              inputEl.required = true;
-            }
-
-            wrapper.appendChild(inputEl);
-            container.appendChild(wrapper);
-          });
-        }
-
-        function renderDynamicForm(text, fields) {
-          const container = elements.plannerFields;
-          if (!container) return;
-          container.innerHTML = "";
-
-          const fieldsArray = Array.isArray(fields) ? fields : [];
-
-          fieldsArray.forEach((field) => {
-            if (!field || !field.key) return;
-
-            const wrapper = document.createElement("label");
-            wrapper.dataset.key = field.key;
-            wrapper.style.display = "flex";
-            wrapper.style.flexDirection = "column";
-            wrapper.style.gap = "6px";
-
-            const labelEl = document.createElement("span");
-            const requiredMark = field.required ? " *" : "";
-            labelEl.textContent = `${field.label || field.key}${requiredMark}`;
-            wrapper.appendChild(labelEl);
-
-            const fieldType = (field.type || "text").toLowerCase();
-            let inputEl;
-
-            if (fieldType === "textarea") {
-              inputEl = document.createElement("textarea");
-            } else if (fieldType === "select") {
-              inputEl = document.createElement("select");
-              const options = Array.isArray(field.options) ? field.options : [];
-              options.forEach((opt) => {
-                const optionEl = document.createElement("option");
-                let value;
-                let label;
-                if (typeof opt === "string") {
-                  value = opt;
-                  label = opt;
-                } else {
-                  value = opt.value ?? opt.id ?? opt.label ?? "";
-                  label = opt.label ?? String(value);
-                }
-                optionEl.value = value;
-                optionEl.textContent = label;
-                inputEl.appendChild(optionEl);
-              });
-            } else {
-              inputEl = document.createElement("input");
-              inputEl.type = fieldType === "number" ? "number" : "text";
-            }
-
-            inputEl.name = field.key;
-            if (field.placeholder) {
-              inputEl.placeholder = field.placeholder;
-            }
-            if (field.required) {
-              inputEl.required = true;
-            }
-
-            wrapper.appendChild(inputEl);
-            container.appendChild(wrapper);
-          });
-        }
-
-        function handlePlannerMessage(msg) {
-          if (msg.message && msg.message.type === "form") {
-            renderDynamicForm(msg.message.text, msg.message.fields);
-            togglePlannerForm(true);
-            return;
-          }
-          
-          // If msg.message exists but we're not handling it as a form, log it to catch payload mismatches
-          if (msg.message && msg.message.type !== "form") {
-            console.log("Unhandled planner message:", msg.message);
-          }
-          
-          const messageText = msg.message?.text || JSON.stringify(msg.message || msg, null, 2);
-          addMessage("assistant", messageText);
-        }
-
-        function sendUserMessage(text) {
-          const trimmed = (text || elements.userInput.value).trim();
-          if (!trimmed || !state.runId) return;
-          state.ws?.send(
-            JSON.stringify({
-              type: "USER_MESSAGE",
-              run_id: state.runId,
-              text: trimmed,
-            })
-          );
-          addMessage("user", trimmed);
-          elements.userInput.value = "";
-          togglePlannerForm(false);
-        }
-
-        function sendDecision(decision) {
-          if (!state.runId || !state.paused) return;
-          state.ws?.send(
-            JSON.stringify({
-              type: "STEP_DECISION",
-              run_id: state.runId,
-              step_id: state.paused.step_id,
-              decision,
-            })
-          );
-          appendLog(`Decision sent: ${decision}`);
-          if (decision === "SKIP_STEP") {
-            updateStepStatus(state.paused.step_id, "SKIPPED");
-          } else if (decision === "SKIP_DEPENDENTS") {
-            updateStepStatus(state.paused.step_id, "SKIPPED");
-            markDependentsSkipped(state.paused.step_id);
-          } else if (decision === "RETRY_STEP") {
-            updateStepStatus(state.paused.step_id, "PENDING");
-          }
-          state.paused = null;
-          state.phase = "EXECUTING";
-          render();
-        }
-
-        elements.decisionButtons.forEach((btn) => {
-          btn.addEventListener("click", () => sendDecision(btn.dataset.decision));
-        });
-
-        elements.sendBtn.addEventListener("click", () => sendUserMessage());
-        elements.userInput.addEventListener("keydown", (evt) => {
-          if (evt.key === "Enter" && evt.metaKey) {
-            sendUserMessage();
-          }
-        });
-
-        elements.startBtn.addEventListener("click", () => {
-          const intent = elements.intent.value.trim();
-          if (!intent) {
-            elements.intent.focus();
-            return;
-          }
-          const payload = {
-            type: "START_RUN",
-            tool_key: "clickup",
-            intent,
-            user_context: {},
-          };
-          const fail = elements.failStep.value.trim();
-          if (fail) {
-            payload.fail_on_step_id = fail;
-          }
-          state.phase = "PLANNING";
-          state.ws?.send(JSON.stringify(payload));
-          appendLog("START_RUN sent.");
-          elements.startBtn.disabled = true;
-          render();
-        });
-
-        elements.plannerSubmit.addEventListener("click", () => {
-          if (!state.runId || !elements.plannerFields) return;
-
-          const values = {};
-          const fieldWrappers = elements.plannerFields.querySelectorAll("label[data-key]");
-
-          fieldWrappers.forEach((wrapper) => {
-            const key = wrapper.dataset.key;
-            if (!key) return;
-            const inputEl = wrapper.querySelector("input, select, textarea");
-            if (!inputEl) return;
-
-            let value = inputEl.value;
-            if (inputEl.tagName === "INPUT" && inputEl.type === "number") {
-              value = value === "" ? null : Number(value);
-            }
-            values[key] = value;
-          });
-
-          state.ws?.send(
-            JSON.stringify({
-              type: "USER_MESSAGE",
-              run_id: state.runId,
-              text: "",
-              metadata: {
-                form_response: values,
-              },
-            })
-          );
-
-          togglePlannerForm(false);
-        });
-        elements.plannerHide.addEventListener("click", () => togglePlannerForm(false));
-
-        const ws = new WebSocket(wsUrl);
-        state.ws = ws;
-
-        ws.addEventListener("open", () => appendLog("Connected to orchestrator."));
-        ws.addEventListener("close", () => appendLog("Connection closed."));
-
-        ws.addEventListener("message", (event) => {
-          const msg = JSON.parse(event.data);
-          switch (msg.type) {
-            case "RUN_CREATED":
-              state.runId = msg.run_id;
-              state.phase = "PLANNING";
-              appendLog("Run created: " + state.runId);
-              render();
-              break;
-            case "PLANNER_MESSAGE":
-              console.log("PLANNER_MESSAGE raw:", msg);
-              console.log("PLANNER_MESSAGE message:", msg.message);
-              handlePlannerMessage(msg);
-              break;
-            case "PLAN_ACCEPTED":
-              if (msg.plan) setPlanSteps(msg.plan);
-              state.phase = "EXECUTING";
-              appendLog("Plan accepted.");
-              render();
-              break;
-            case "EXEC_EVENT": {
-              const eventPayload = normalizeExecEvent(msg);
-              if (!eventPayload || eventPayload.type === "RUN_SUMMARY") break;
-              state.execEvents.push(eventPayload);
-              if (eventPayload.type === "STEP_STARTED") {
-                updateStepStatus(eventPayload.step_id, "RUNNING");
-              } else if (eventPayload.type === "STEP_DONE") {
-                updateStepStatus(eventPayload.step_id, "DONE");
-              } else if (eventPayload.type === "STEP_FAILED") {
-                updateStepStatus(eventPayload.step_id, "FAILED");
-              }
-              appendLog(
-                `Event: ${eventPayload.type}${
-                  eventPayload.step_id ? " (" + eventPayload.step_id + ")" : ""
-                }`
-              );
-              break;
-            }
-            case "NEED_STEP_DECISION":
-              state.phase = "PAUSED";
-              state.paused = { step_id: msg.step_id, error: msg.error };
-              updateStepStatus(msg.step_id, "PAUSED");
-              appendLog("Awaiting decision for " + msg.step_id);
-              render();
-              break;
-            case "RUN_DONE":
-              state.phase = "DONE";
-              state.paused = null;
-              state.final = {
-                status: msg.status || msg.result?.status,
-                summary: msg.summary || "Run completed.",
-                archive_ref: msg.archive_ref || msg.result?.archive_ref,
-              };
-              elements.startBtn.disabled = false;
-              toggleComposer(false);
-              togglePlannerForm(false);
-              appendLog("Run completed.");
-              render();
-              break;
-            case "RUN_ERROR":
-              state.phase = "DONE";
-              state.paused = null;
-              const errText = msg.error?.message || "Unknown error.";
-              addMessage("assistant", "Something went wrong: " + errText);
-              appendLog("Error: " + errText);
-              render();
-              break;
-            case "PLAN_INVALID":
-              appendLog("Plan invalid: " + JSON.stringify(msg.errors || []));
-              break;
-            default:
-              appendLog("Event: " + msg.type);
-          }
-        });
-
-        render();
-      })();
-    </script>
+    <script src="{js_url}" defer></script>
   </body>
 </html>
 """
 
+# The demo page is static, so encode and compress it once at import and let
+# browsers revalidate by ETag.
+_TEST_PAGE_BYTES: bytes = _TEST_HTML.format(
+    css_url=_asset_url("vimani.css"),
+    js_url=_asset_url("vimani.js"),
+).encode("utf-8")
+_TEST_PAGE_DIGEST = hashlib.md5(_TEST_PAGE_BYTES).hexdigest()
+
+
+def _page_variant(body: bytes, encoding: str) -> Tuple[bytes, Dict[str, str]]:
+    headers = {
+        "cache-control": "public, max-age=300",
+        "vary": "accept-encoding",
+        "etag": f'"{_TEST_PAGE_DIGEST}-{encoding}"',
+    }
+    if encoding != "identity":
+        headers["content-encoding"] = encoding
+    return body, headers
+
+
+_TEST_PAGE_VARIANTS: Dict[str, Tuple[bytes, Dict[str, str]]] = {
+    "identity": _page_variant(_TEST_PAGE_BYTES, "identity"),
+    "gzip": _page_variant(gzip.compress(_TEST_PAGE_BYTES, compresslevel=9), "gzip"),
+}
+if brotli is not None:
+    _TEST_PAGE_VARIANTS["br"] = _page_variant(brotli.compress(_TEST_PAGE_BYTES, quality=11), "br")
+
+
+def _accepted_encodings(header: str) -> frozenset:
+    """Return the content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    rejected = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        (accepted if q > 0 else rejected).add(coding)
+    if "*" in accepted:
+        # The wildcard covers every coding not listed explicitly.
+        accepted.update(coding for coding in _TEST_PAGE_VARIANTS if coding not in rejected)
+    return frozenset(accepted)
+
+
+@router.get("/test", response_class=HTMLResponse)
+async def test_page(request: Request) -> Response:
+    accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+    if "br" in accepted and "br" in _TEST_PAGE_VARIANTS:
+        encoding = "br"
+    elif "gzip" in accepted:
+        encoding = "gzip"
+    else:
+        encoding = "identity"
+    body, headers = _TEST_PAGE_VARIANTS[encoding]
+    if request.headers.get("if-none-match") == headers["etag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="text/html", headers=headers)
+
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket) -> None:
     await websocket.accept()
 
-    user_messages: asyncio.Queue = asyncio.Queue()
-    step_decisions: asyncio.Queue = asyncio.Queue()
-
-    async def send_event(payload: Dict[str, Any]) -> None:
-        if payload.get("type") == "PLANNER_MESSAGE":
-            print("PLANNER_MESSAGE:", payload)
-        await websocket.send_json(payload)
+    # User messages only; step decisions are routed straight to the orchestrator.
+    inbox: asyncio.Queue = asyncio.Queue()
+    # Unbounded so enqueueing never blocks; send_event enforces the limit.
+    out_queue: asyncio.Queue = asyncio.Queue()
+    outbound_max = settings.ws_outbound_max
+    # Set when the limit is hit with nothing droppable: the client is not
+    # reading, so the connection is given up rather than the queue grown.
+    client_stalled = asyncio.Event()
+
+    def send_event(payload: Dict[str, Any] | orjson.Fragment) -> None:
+        # Once the client is gone, events have nowhere to go; drop them here
+        # rather than queueing work for a writer that will fail to send it.
+        if websocket.client_state is not WebSocketState.CONNECTED:
+            return
+        if logger.isEnabledFor(logging.DEBUG) and type(payload) is dict and payload.get("type") == "PLANNER_MESSAGE":
+            logger.debug("PLANNER_MESSAGE: %r", payload)
+        # Never stall the run on a slow client: make room by dropping a
+        # superseded update. If nothing can be dropped, the client is too far
+        # behind to catch up; stall_watch closes the connection.
+        if out_queue.qsize() >= outbound_max and not _drop_oldest_superseded(out_queue):
+            if not client_stalled.is_set():
+                logger.warning("Outbound queue full (%d events); closing stalled client", outbound_max)
+                client_stalled.set()
+            return
+        out_queue.put_nowait(payload)
+
+    async def writer_loop() -> None:
+        """Drain queued events and send each burst in as few frames as possible.
+
+        A batch is flushed once it holds ``ws_batch_n`` events or
+        ``ws_batch_ms`` has elapsed since its first event was dequeued.
+        Step events for the accepted plan are sent as binary frames. After
+        ``_PING_INTERVAL_S`` with nothing to send, the writer sends a PING; a
+        client that cannot take it within ``_PING_TIMEOUT_S`` is treated as dead.
+        """
+        loop = asyncio.get_running_loop()
+        max_batch = settings.ws_batch_n
+        window = settings.ws_batch_ms / 1000
+        step_index: Dict[Any, Dict[str, int]] = {}
+        if settings.ws_raw_send:
+            # The socket is already accepted, so Starlette's per-send state
+            # checks add nothing; write to the ASGI channel directly.
+            asgi_send = websocket._send  # type: ignore[attr-defined]
+
+            async def send_frame(frame: str | bytes) -> None:
+                key = "bytes" if isinstance(frame, bytes) else "text"
+                await asgi_send({"type": "websocket.send", key: frame})
+        else:
+
+            async def send_frame(frame: str | bytes) -> None:
+                if isinstance(frame, bytes):
+                    await websocket.send_bytes(frame)
+                else:
+                    await websocket.send_text(frame)
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout(_PING_INTERVAL_S):
+                        first = await out_queue.get()
+                except TimeoutError:
+                    # asyncio.timeout rather than wait_for: on 3.11 wait_for can
+                    # swallow a cancellation that races with the send completing.
+                    try:
+                        async with asyncio.timeout(_PING_TIMEOUT_S):
+                            await send_frame(_PING_FRAME)
+                    except TimeoutError:
+                        break
+                    continue
+                batch = [first]
+                deadline = loop.time() + window
+                while len(batch) < max_batch:
+                    try:
+                        batch.append(out_queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        async with asyncio.timeout(remaining):
+                            batch.append(await out_queue.get())
+                    except TimeoutError:
+                        break
+                for frame in _encode_batch(_coalesce_batch(_flatten_batch(batch)), step_index):
+                    await send_frame(frame)
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            # Client went away; the read loop handles cleanup.
+            return
+        await abort_connection()
+
+    async def abort_connection() -> None:
+        """Give up on a dead client: stop the run and close with 1011.
+
+        Raises so the TaskGroup tears down the reader too, rather than
+        waiting on a disconnect that a half-open peer may never send.
+        """
+        if run_task:
+            run_task.cancel()
+        try:
+            async with asyncio.timeout(_PING_TIMEOUT_S):
+                await websocket.close(code=1011)
+        except Exception:
+            # Websocket may already be closed, ignore
+            pass
+        raise WebSocketDisconnect(1011)
+
+    async def stall_watch() -> None:
+        await client_stalled.wait()
+        await abort_connection()
 
     async def wait_for_user_message() -> Any:
-        return await user_messages.get()
-
-    async def wait_for_step_decision() -> Any:
-        """Wait for the next step decision from the queue."""
-        # Note: This returns the next decision regardless of run_id/step_id.
-        # The orchestrator should filter by step_id after receiving it.
-        return await step_decisions.get()
+        return await inbox.get()
 
     orchestrator: OrchestratorService | None = None
     run_task: asyncio.Task | None = None
 
-    def make_error_envelope(
-        code: str,
-        message: str,
-        *,
-        source: ErrorSource = ErrorSource.ORCHESTRATOR,
-        severity: ErrorSeverity = ErrorSeverity.RUN,
-        step_id: str | None = None,
-        retryable: bool = False,
-    ) -> Dict[str, Any]:
-        return ErrorEnvelope(
-            code=code,
-            message=message,
-            source=source,
-            severity=severity,
-            step_id=step_id,
-            retryable=retryable,
-        ).model_dump()
-
-    def resolve_planner() -> Any:
-        planner_mode = (os.getenv("VIMANI_PLANNER") or "").strip().lower()
-        if planner_mode == "llm":
-            return LLMPlanner()
-        return MockPlanner()
-
-    try:
+    def handle_run_task_done(task: asyncio.Task) -> None:
+        """Report a crashed run; runs on the loop thread as a done callback."""
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is None:
+            return
+        if isinstance(exc, VimaniError):
+            # Structured error from orchestrator
+            error = exc.envelope
+        else:
+            # Any other exception - wrap in ErrorEnvelope
+            error = _make_error_envelope(
+                code="RUN_TASK_FAILED",
+                message=f"Run task crashed: {exc}",
+                source=ErrorSource.ORCHESTRATOR,
+                severity=ErrorSeverity.RUN,
+                retryable=False,
+            )
+        # send_event only enqueues, so this needs no task of its own.
+        send_event(orjson.Fragment(_run_error_json(error)))
+
+    def resolve_planner() -> Tuple[Any, orjson.Fragment]:
+        """Return the active planner and its pre-encoded DEBUG frame."""
+        app_state = websocket.app.state
+        if PLANNER_MODE == "llm":
+            if app_state.planner_llm is None:
+                app_state.planner_llm = LLMPlanner()
+            return app_state.planner_llm, _LLM_PLANNER_DEBUG
+        return app_state.planner_mock, _MOCK_PLANNER_DEBUG
+
+    async def reader_loop() -> None:
+        nonlocal orchestrator, run_task
         while True:
-            message = await websocket.receive_json()
+            # orjson parses the frame directly; it accepts both str and bytes.
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000), frame.get("reason"))
+            text = frame.get("text")
+            message = orjson.loads(text if text is not None else frame["bytes"])
             msg_type = message.get("type")
 
             if msg_type == "START_RUN":
                 tool_key = message.get("tool_key")
                 intent = message.get("intent")
-                user_context = dict(message.get("user_context") or {})
+                # Passed by reference: the orchestrator only reads user_context.
+                user_context = message.get("user_context") or _EMPTY_DICT
                 fail_on_step_id = message.get("fail_on_step_id")
 
-                if fail_on_step_id is not None:
-                    user_context["fail_on_step_id"] = fail_on_step_id
-
                 # Emit debug info before constructing planner to confirm env vars at runtime.
-                planner_mode = (os.getenv("VIMANI_PLANNER") or "").strip().lower()
-                planner_type = "LLM" if planner_mode == "llm" else "Mock"
-                has_api_key = bool(os.getenv("OPENAI_API_KEY"))
-                await send_event({
-                    "type": "DEBUG",
-                    "message": f"START_RUN: OPENAI_API_KEY present={has_api_key}, planner={planner_type}"
-                })
+                send_event(_START_RUN_DEBUG)
 
                 try:
-                    planner_impl = resolve_planner()
+                    planner_impl, planner_debug = resolve_planner()
                 except Exception as exc:
-                    await websocket.send_json(
-                        {
-                            "type": "RUN_ERROR",
-                            "error": make_error_envelope(
-                                code="PLANNER_INIT_FAILED",
-                                message=str(exc),
-                            ),
-                        }
-                    )
+                    send_event(orjson.Fragment(_templated_error(_PLANNER_INIT_FAILED, str(exc))))
                     continue
 
                 # Emit a debug event so we can confirm the active planner at runtime.
-                if isinstance(planner_impl, LLMPlanner):
-                    debug_message = f"planner=LLMPlanner model={settings.planner_model}"
-                else:
-                    debug_message = "planner=MockPlanner"
-                await send_event({"type": "DEBUG", "message": debug_message})
+                send_event(planner_debug)
 
                 orchestrator = OrchestratorService(
                     planner=planner_impl,
-                    executor=MockExecutor(),
-                    archivist=JsonlArchivist(),
+                    executor=websocket.app.state.executor,
+                    archivist=websocket.app.state.archivist,
                 )
                 
-                async def handle_run_task_done(task: asyncio.Task) -> None:
-                    """Handle run task completion and catch any exceptions."""
-                    try:
-                        # This will raise if the task raised an exception
-                        task.result()
-                    except VimaniError as ve:
-                        # Structured error from orchestrator
-                        envelope = ve.envelope
-                        error_dict = envelope.model_dump() if hasattr(envelope, "model_dump") else envelope
-                        try:
-                            await websocket.send_json({
-                                "type": "RUN_ERROR",
-                                "error": error_dict,
-                            })
-                        except Exception:
-                            # Websocket may be closed, ignore
-                            pass
-                    except Exception as exc:
-                        # Any other exception - wrap in ErrorEnvelope
-                        try:
-                            await websocket.send_json({
-                                "type": "RUN_ERROR",
-                                "error": make_error_envelope(
-                                    code="RUN_TASK_FAILED",
-                                    message=f"Run task crashed: {exc}",
-                                    source=ErrorSource.ORCHESTRATOR,
-                                    severity=ErrorSeverity.RUN,
-                                    retryable=False,
-                                ),
-                            })
-                        except Exception:
-                            # Websocket may be closed, ignore
-                            pass
-
                 run_task = asyncio.create_task(
                     orchestrator.start_run(
                         tool_key=tool_key,
@@ -1009,10 +638,10 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                         user_context=user_context,
                         send_event=send_event,
                         wait_for_user_message=wait_for_user_message,
-                        wait_for_step_decision=wait_for_step_decision,
+                        fail_on_step_id=fail_on_step_id,
                     )
                 )
-                run_task.add_done_callback(lambda task: asyncio.create_task(handle_run_task_done(task)))
+                run_task.add_done_callback(handle_run_task_done)
             elif msg_type == "USER_MESSAGE":
                 user_payload = {
                     "role": "user",
@@ -1020,45 +649,38 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
                     "text": message.get("text", ""),
                     "metadata": message.get("metadata") if "metadata" in message else None,
                 }
-                await user_messages.put(user_payload)
+                inbox.put_nowait(user_payload)
             elif msg_type == "STEP_DECISION":
-                await step_decisions.put(message)
+                run_id = message.get("run_id")
+                step_id = message.get("step_id")
+                if orchestrator is None or not orchestrator.submit_step_decision(run_id, step_id, message.get("decision")):
+                    logger.debug("Ignoring step decision with no pending request: run_id=%s step_id=%s", run_id, step_id)
             else:
-                await websocket.send_json(
-                    {
-                        "type": "RUN_ERROR",
-                        "error": make_error_envelope(
-                            code="UNKNOWN_MESSAGE",
-                            message="Unknown message type",
-                        ),
-                    }
-                )
-    except WebSocketDisconnect:
-        if run_task:
-            run_task.cancel()
-        return
-    except VimaniError as ve:
-        envelope = ve.envelope
-        payload = envelope.model_dump() if hasattr(envelope, "model_dump") else envelope
-        await websocket.send_json(
-            {
-                "type": "RUN_ERROR",
-                "error": payload,
-            }
-        )
-        return
-    except Exception as exc:  # pragma: no cover - guardrail for WS lifecycle
-        await websocket.send_json(
-            {
-                "type": "RUN_ERROR",
-                "error": make_error_envelope(
-                    code="WS_FAILURE",
-                    message=str(exc),
-                ),
-            }
-        )
+                send_event(_UNKNOWN_MESSAGE_ERROR)
+
+    # Reader, writer and stall watch share one lifetime: when any of them ends
+    # with an error (e.g. the reader sees the client disconnect, or the writer
+    # or stall watch gives up on a dead client), the others are cancelled
+    # with it, so nothing keeps sending into a closed socket.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(writer_loop(), name="ws-writer")
+            tg.create_task(stall_watch(), name="ws-stall-watch")
+            tg.create_task(reader_loop(), name="ws-reader")
+    except* WebSocketDisconnect:
+        pass
+    except* VimaniError as eg:
+        await _send_error(websocket, _run_error_json(eg.exceptions[0].envelope))
+    except* Exception as eg:  # pragma: no cover - guardrail for WS lifecycle
+        await _send_error(websocket, _templated_error(_WS_FAILURE, str(eg.exceptions[0])))
     finally:
         if run_task:
             run_task.cancel()
+            # Give the cancellation a chance to land. The queues belong to this
+            # connection alone, so a run that outlives the wait can only
+            # write into them, and send_event drops events once disconnected.
+            done, _ = await asyncio.wait((run_task,), timeout=_PING_TIMEOUT_S)
+            if not done:
+                logger.warning("Run task still running %.0fs after cancellation", _PING_TIMEOUT_S)
         if websocket.client_state == WebSocketState.CONNECTED:
             await websocket.close()
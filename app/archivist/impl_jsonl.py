@@ -1,21 +1,71 @@
-import json
+import asyncio
+import logging
+import os
+import threading
 import time
 import uuid
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import orjson
 
 from app.archivist.interface import Archivist
+from app.serialization import orjson_default
+
+
+logger = logging.getLogger(__name__)
 
 
 class JsonlArchivist(Archivist):
-    """Writes run results to a local JSONL file."""
+    """Writes run results to a local JSONL file.
+
+    ``store_run_async`` hands its record to a single long-lived writer
+    thread and returns once the record is on disk. Records that arrive while
+    a write is in progress go out together in the next one, so a burst of
+    runs costs one write rather than one each. ``store_run`` writes inline.
+    ``close()`` writes what is left and stops the thread; app.main's
+    lifespan calls it on shutdown.
+    """
+
+    FLUSH_BYTES = 64 * 1024
 
     def __init__(self, filepath: Optional[str] = None) -> None:
         self.filepath = Path(filepath or "backend/runs.jsonl")
+        self._fh: Optional[BinaryIO] = None
+        self._buf: List[bytes] = []
+        # Futures of store_run_async callers whose records are in _buf.
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._closed = False
+        self._writer: Optional[threading.Thread] = None
+        # _buf_lock guards the buffer (_pending waits on it); _write_lock
+        # keeps flushes in order.
+        self._buf_lock = threading.Lock()
+        self._pending = threading.Condition(self._buf_lock)
+        self._write_lock = threading.Lock()
 
     def store_run(self, payload: Dict[str, Any]) -> Dict[str, str]:
-        self.filepath.parent.mkdir(parents=True, exist_ok=True)
-        
+        archive_ref, line = self._encode_record(payload)
+        with self._buf_lock:
+            self._buf.append(line)
+        self.flush()
+        return {"archive_ref": archive_ref}
+
+    async def store_run_async(self, payload: Dict[str, Any]) -> Dict[str, str]:
+        archive_ref, line = self._encode_record(payload)
+        loop = asyncio.get_running_loop()
+        written = loop.create_future()
+        with self._pending:
+            self._buf.append(line)
+            self._waiters.append((loop, written))
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_forever, name="jsonl-archivist", daemon=True)
+                self._writer.start()
+            self._pending.notify()
+        await written
+        return {"archive_ref": archive_ref}
+
+    def _encode_record(self, payload: Dict[str, Any]) -> Tuple[str, bytes]:
+        """Return the archive_ref and encoded JSONL line for one record."""
         archive_ref = payload.get("run_id") or str(uuid.uuid4())
         stored_at = int(time.time())
         
@@ -25,9 +75,72 @@ class JsonlArchivist(Archivist):
             "archive_ref": archive_ref
         }
         
-        with self.filepath.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(record) + "\n")
-        
-        return {"archive_ref": archive_ref}
+        return archive_ref, orjson.dumps(record, default=orjson_default, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _write_forever(self) -> None:
+        """Writer thread: flush whenever records are buffered, until close()."""
+        while True:
+            with self._pending:
+                while not self._buf and not self._closed:
+                    self._pending.wait()
+                if not self._buf:
+                    return
+            try:
+                self.flush()
+            except Exception:  # pragma: no cover - disk errors reach the waiters
+                logger.exception("Writing %s failed", self.filepath)
+
+    def flush(self) -> None:
+        """Append all buffered records to the file and wake their waiters."""
+        with self._write_lock:
+            with self._buf_lock:
+                pending, self._buf = self._buf, []
+                waiters, self._waiters = self._waiters, []
+            error: Optional[BaseException] = None
+            try:
+                if pending:
+                    fh = self._fh_open()
+                    fh.write(b"".join(pending))
+                    fh.flush()
+            except BaseException as exc:
+                error = exc
+                raise
+            finally:
+                for loop, written in waiters:
+                    try:
+                        loop.call_soon_threadsafe(_settle, written, error)
+                    except RuntimeError:
+                        # The caller's loop has closed; nobody is waiting.
+                        pass
+
+    def _fh_open(self) -> BinaryIO:
+        """Return the append handle, opening it on first use."""
+        if self._fh is None:
+            self.filepath.parent.mkdir(parents=True, exist_ok=True)
+            # O_APPEND keeps each write atomic at end-of-file, even if other
+            # processes append to the same archive.
+            fd = os.open(self.filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._fh = os.fdopen(fd, "ab", buffering=self.FLUSH_BYTES)
+        return self._fh
+
+    def close(self) -> None:
+        with self._pending:
+            self._closed = True
+            self._pending.notify()
+        if self._writer is not None:
+            self._writer.join()
+            self._writer = None
+        self.flush()
+        with self._write_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
 
 
+def _settle(written: asyncio.Future, error: Optional[BaseException]) -> None:
+    if written.done():
+        return
+    if error is None:
+        written.set_result(None)
+    else:
+        written.set_exception(error)
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any, Dict
 
@@ -7,6 +8,12 @@ class Archivist(ABC):
 
     @abstractmethod
     def store_run(self, payload: Dict[str, Any]) -> Dict[str, str]:
+        """Persist a run. Payload values may still be pydantic models."""
         raise NotImplementedError
 
+    async def store_run_async(self, payload: Dict[str, Any]) -> Dict[str, str]:
+        """Store a run without blocking the event loop on I/O."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.store_run, payload)
 
+    def close(self) -> None:
+        """Flush any pending writes and release resources."""
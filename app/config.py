@@ -1,28 +1,58 @@
 import os
-from typing import Any, Optional
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
 
 from app.errors import VimaniError
 from app.orchestrator.models import ErrorEnvelope, ErrorSeverity, ErrorSource
 
 
+# Load environment variables from backend/.env before anything reads them;
+# settings below are read once, so this happens whatever the entry point.
+ENV_PATH = Path(__file__).resolve().parents[1] / ".env"
+load_dotenv(dotenv_path=ENV_PATH, override=True)
+
+
+def _env_flag(name: str, default: str = "") -> bool:
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes")
+
+
 class Settings:
     """
     Central configuration for backend services.
 
-    Reads environment variables at runtime when properties are accessed.
+    Environment variables are read once, when the instance is created.
     """
 
     def __init__(self) -> None:
-        self._openai_api_key: Optional[str] = None
-        self._planner_model: Optional[str] = None
+        self._openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
+        # Level for the app.* loggers (planner debug output needs DEBUG).
+        self.log_level: str = os.getenv("VIMANI_LOG_LEVEL", "INFO").upper()
+        self.planner_model: str = os.getenv("VIMANI_PLANNER_MODEL", "gpt-4.1-mini")
+        # Smaller model for simple planner turns; unset routes everything to planner_model.
+        self.planner_model_small: Optional[str] = os.getenv("VIMANI_PLANNER_MODEL_SMALL") or None
+        # Turns scoring below this (conversation messages + registry operations) count as simple.
+        self.planner_small_max_score: int = int(os.getenv("VIMANI_PLANNER_SMALL_MAX_SCORE", "8"))
+        # Let BatchLLMPlanner.next_batch submit through the OpenAI Batch API.
+        self.planner_batch_mode: bool = _env_flag("VIMANI_PLANNER_BATCH")
+        # Time window (ms) the WebSocket writer waits to coalesce a burst.
+        self.ws_batch_ms: float = float(os.getenv("VIMANI_WS_BATCH_MS", "10"))
+        # Maximum number of events sent in a single WebSocket frame.
+        self.ws_batch_n: int = int(os.getenv("VIMANI_WS_BATCH_N", "64"))
+        # Maximum number of events buffered per WebSocket before dropping.
+        self.ws_outbound_max: int = int(os.getenv("VIMANI_WS_OUTBOUND_MAX", "512"))
+        # Send WebSocket frames straight to the ASGI channel, bypassing Starlette's wrapper.
+        self.ws_raw_send: bool = _env_flag("VIMANI_WS_RAW_SEND")
+        # Negotiate permessage-deflate on WebSocket connections (server-wide).
+        # Off by default: most frames are small and compressing each costs more than it saves.
+        self.ws_per_message_deflate: bool = _env_flag("VIMANI_WS_DEFLATE")
 
     @property
     def openai_api_key(self) -> str:
         """
         Return the OpenAI API key or raise a structured planner error if missing.
         """
-        if self._openai_api_key is None:
-            self._openai_api_key = os.getenv("OPENAI_API_KEY")
         if not self._openai_api_key:
             raise VimaniError(
                 ErrorEnvelope(
@@ -35,12 +65,6 @@ class Settings:
             )
         return self._openai_api_key
 
-    @property
-    def planner_model(self) -> str:
-        if self._planner_model is None:
-            self._planner_model = os.getenv("VIMANI_PLANNER_MODEL", "gpt-4.1-mini")
-        return self._planner_model
-
 
 _settings_instance: Optional[Settings] = None
 
@@ -53,14 +77,4 @@ def get_settings() -> Settings:
     return _settings_instance
 
 
-# For backward compatibility, provide a settings object that lazily initializes
-class _SettingsProxy:
-    """Proxy that lazily initializes Settings on first access."""
-
-    def __getattr__(self, name: str) -> Any:
-        return getattr(get_settings(), name)
-
-
-settings = _SettingsProxy()
-
-
+settings = get_settings()
@@ -1,12 +1,21 @@
 import asyncio
+import os
 from typing import Any, AsyncGenerator, Dict, Optional
 
 from app.executor.interface import Executor
-from app.orchestrator.models import ErrorEnvelope, ErrorSeverity, ErrorSource, ExecEvent, ExecutionEventType, Plan
+from app.orchestrator.models import ErrorEnvelope, ErrorSeverity, ErrorSource, ExecEvent, ExecutionEventType, Plan, PlanStep
 
 
 class MockExecutor(Executor):
-    """Mock executor that simulates plan execution with async events."""
+    """Mock executor that simulates plan execution with async events.
+
+    Events are built with ``model_construct``: every field comes from the
+    validated plan or from literals here, so it already has the field's type.
+    """
+
+    def __init__(self) -> None:
+        # Simulated per-step work; set VIMANI_MOCK_STEP_DELAY=0 to profile the event path.
+        self._step_delay = float(os.getenv("VIMANI_MOCK_STEP_DELAY", "0.5"))
 
     def fetch_state(self, tool_key: str, user_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         return {
@@ -23,46 +32,73 @@ class MockExecutor(Executor):
         fail_on_step_id: Optional[str] = None,
     ) -> AsyncGenerator[ExecEvent, None]:
         for step in plan.steps:
-            yield ExecEvent(
-                type=ExecutionEventType.STEP_STARTED,
-                step_id=step.step_id,
-                ts=asyncio.get_event_loop().time()
-            )
-            
-            yield ExecEvent(
-                type=ExecutionEventType.STEP_LOG,
-                step_id=step.step_id,
-                message=f"Executing {step.op_id}",
-                ts=asyncio.get_event_loop().time()
-            )
-            
-            await asyncio.sleep(0.5)
-            
-            if fail_on_step_id == step.step_id:
-                yield ExecEvent(
-                    type=ExecutionEventType.STEP_FAILED,
-                    step_id=step.step_id,
-                    error=ErrorEnvelope(
-                        code="MOCK_FAILURE",
-                        message="Mock failure for testing",
-                        source=ErrorSource.EXECUTOR,
-                        step_id=step.step_id,
-                        retryable=True,
-                        severity=ErrorSeverity.STEP
-                    ),
-                    ts=asyncio.get_event_loop().time()
-                )
+            async for event in self.execute_step(tool_key, step, user_context, fail_on_step_id):
+                yield event
+            if event.type == ExecutionEventType.STEP_FAILED:
                 return
-            else:
-                yield ExecEvent(
-                    type=ExecutionEventType.STEP_DONE,
-                    step_id=step.step_id,
-                    output={"ok": True, "step_id": step.step_id},
-                    ts=asyncio.get_event_loop().time()
-                )
         
-        yield ExecEvent(
+        yield ExecEvent.model_construct(
             type=ExecutionEventType.RUN_SUMMARY,
-            ts=asyncio.get_event_loop().time()
+            step_id=None,
+            message=None,
+            output=None,
+            error=None,
+            ts=asyncio.get_running_loop().time()
         )
 
+    async def execute_step(
+        self,
+        tool_key: str,
+        step: PlanStep,
+        user_context: Optional[Dict[str, Any]] = None,
+        fail_on_step_id: Optional[str] = None,
+    ) -> AsyncGenerator[ExecEvent, None]:
+        loop = asyncio.get_running_loop()
+        ts = loop.time()
+        yield ExecEvent.model_construct(
+            type=ExecutionEventType.STEP_STARTED,
+            step_id=step.step_id,
+            message=None,
+            output=None,
+            error=None,
+            ts=ts
+        )
+        
+        yield ExecEvent.model_construct(
+            type=ExecutionEventType.STEP_LOG,
+            step_id=step.step_id,
+            message=f"Executing {step.op_id}",
+            output=None,
+            error=None,
+            ts=ts
+        )
+        
+        if self._step_delay:
+            await asyncio.sleep(self._step_delay)
+        ts = loop.time()
+        
+        if fail_on_step_id == step.step_id:
+            yield ExecEvent.model_construct(
+                type=ExecutionEventType.STEP_FAILED,
+                step_id=step.step_id,
+                message=None,
+                output=None,
+                error=ErrorEnvelope.model_construct(
+                    code="MOCK_FAILURE",
+                    message="Mock failure for testing",
+                    source=ErrorSource.EXECUTOR,
+                    step_id=step.step_id,
+                    retryable=True,
+                    severity=ErrorSeverity.STEP
+                ),
+                ts=ts
+            )
+        else:
+            yield ExecEvent.model_construct(
+                type=ExecutionEventType.STEP_DONE,
+                step_id=step.step_id,
+                message=None,
+                output={"ok": True, "step_id": step.step_id},
+                error=None,
+                ts=ts
+            )
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, AsyncGenerator, Dict, Optional
 
-from app.orchestrator.models import ExecEvent, Plan
+from app.orchestrator.models import ExecEvent, Plan, PlanStep
 
 
 class Executor(ABC):
@@ -21,4 +21,19 @@ class Executor(ABC):
     ) -> AsyncGenerator[ExecEvent, None]:
         raise NotImplementedError
 
-
+    async def execute_step(
+        self,
+        tool_key: str,
+        step: PlanStep,
+        user_context: Optional[Dict[str, Any]] = None,
+        fail_on_step_id: Optional[str] = None,
+    ) -> AsyncGenerator[ExecEvent, None]:
+        """Run a single step. The default wraps it in a one-step plan."""
+        plan = Plan.model_construct(
+            plan_id=f"step_{step.step_id}",
+            tool_key=tool_key,
+            objective=f"Execute step {step.step_id}",
+            steps=[step],
+        )
+        async for event in self.execute_plan(tool_key, plan, user_context=user_context, fail_on_step_id=fail_on_step_id):
+            yield event
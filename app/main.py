@@ -1,26 +1,79 @@
 import logging
 import os
-from pathlib import Path
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from typing import AsyncIterator, Tuple
 
-from dotenv import load_dotenv
-
-# Load environment variables from backend/.env before anything else.
-ENV_PATH = Path(__file__).resolve().parents[1] / ".env"
-load_dotenv(dotenv_path=ENV_PATH, override=True)
+# Imported first: app.config loads backend/.env.
+from app.config import ENV_PATH
 
 from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is unavailable on Windows
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 logger.info("ENV_PATH resolved to %s (exists=%s)", ENV_PATH, ENV_PATH.exists())
 logger.info("OPENAI_API_KEY loaded? %s", bool(os.getenv("OPENAI_API_KEY")))
 
 
+class ImmutableStaticFiles(StaticFiles):
+    """Static files served with long-lived cache headers (URLs carry a content hash)."""
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["cache-control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+def _start_log_listener(level: str) -> Tuple[QueueHandler, QueueListener]:
+    """Send app.* log records through a queue to a stream handler on a background thread.
+
+    Callers only enqueue the record; writing to stderr happens off the event loop.
+    """
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    queue_handler = QueueHandler(log_queue)
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(level)
+    app_logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return queue_handler, listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Build the planner/executor/archivist once and share them across connections."""
+    from app.archivist.impl_jsonl import JsonlArchivist
+    from app.config import settings
+    from app.executor.impl_mock import MockExecutor
+    from app.planner.impl_mock import MockPlanner
+
+    log_handler, log_listener = _start_log_listener(settings.log_level)
+    app.state.planner_mock = MockPlanner()
+    # Built on the first LLM run, since it requires OPENAI_API_KEY.
+    app.state.planner_llm = None
+    app.state.executor = MockExecutor()
+    app.state.archivist = JsonlArchivist()
+    yield
+    app.state.archivist.close()
+    logging.getLogger("app").removeHandler(log_handler)
+    log_listener.stop()
+
+
 def create_app() -> FastAPI:
     """Application factory to keep imports lightweight."""
-    from app.api.ws import router as ws_router
+    from app.api.ws import STATIC_DIR, router as ws_router
     
-    app = FastAPI(title="Vimani Orchestrator POC")
+    app = FastAPI(title="Vimani Orchestrator POC", lifespan=lifespan)
     app.include_router(ws_router)
+    app.mount("/static", ImmutableStaticFiles(directory=STATIC_DIR), name="static")
 
     @app.get("/health")
     async def health() -> dict:
@@ -31,3 +84,20 @@ def create_app() -> FastAPI:
 
 app = create_app()
 
+
+if __name__ == "__main__":
+    import uvicorn
+
+    from app.config import settings
+
+    # Compression is negotiated per connection, not per frame, so small
+    # frames are deflated too; the writer's batching keeps those rare.
+    uvicorn.run(
+        app,
+        host=os.getenv("VIMANI_HOST", "127.0.0.1"),
+        port=int(os.getenv("VIMANI_PORT", "8000")),
+        ws_per_message_deflate=settings.ws_per_message_deflate,
+        # Run on libuv when available (Linux/macOS); Windows keeps the default
+        # loop. The uvicorn CLI's default loop="auto" makes the same choice.
+        loop="uvloop" if uvloop is not None else "asyncio",
+    )
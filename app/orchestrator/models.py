@@ -84,7 +84,7 @@ class MessageChoice(BaseModel):
 
 
 class Message(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     role: str
     type: MessageType
@@ -114,7 +114,7 @@ class Plan(BaseModel):
 
 
 class ValidationError(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     code: str
     message: str
@@ -125,7 +125,7 @@ class ValidationError(BaseModel):
 
 
 class ErrorEnvelope(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     code: str
     message: str
@@ -142,6 +142,7 @@ class ExecutionEventType(str, Enum):
     PLAN_INVALID = "PLAN_INVALID"
     PLAN_ACCEPTED = "PLAN_ACCEPTED"
     EXEC_EVENT = "EXEC_EVENT"
+    EXEC_EVENT_BATCH = "EXEC_EVENT_BATCH"
     NEED_STEP_DECISION = "NEED_STEP_DECISION"
     RUN_DONE = "RUN_DONE"
     RUN_ERROR = "RUN_ERROR"
@@ -153,7 +154,7 @@ class ExecutionEventType(str, Enum):
 
 
 class ExecEvent(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     type: ExecutionEventType
     step_id: Optional[str] = None
@@ -1,54 +1,155 @@
 import asyncio
 import inspect
-import json
 import uuid
-from enum import Enum
-from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from pydantic_core import to_jsonable_python
 
 from app.archivist.interface import Archivist
 from app.executor.interface import Executor
 from app.orchestrator.models import ErrorEnvelope, ErrorSeverity, ErrorSource, ExecutionEventType, ExecEvent, Message, MessageType, Plan, PlanStep, RunResult, RunStatus, StepDecision, ValidationError
 from app.orchestrator.validation import validate_plan
 from app.planner.interface import Planner, PlannerInput
+from app.registries import get_registry
+
+
+def load_registry(tool_key: str) -> Mapping[str, Any]:
+    """Load the operation registry for a given tool (shared, read-only)."""
+    return get_registry(tool_key)
+
+
+# Executor events are emitted in batches of up to EXEC_EVENT_BATCH_MAX; a batch
+# is cut early at any event that changes a step's status so progress shows
+# without waiting on the rest of the step.
+EXEC_EVENT_BATCH_MAX = 16
+_FLUSH_EVENT_TYPES = frozenset(
+    {ExecutionEventType.STEP_STARTED, ExecutionEventType.STEP_DONE, ExecutionEventType.STEP_FAILED}
+)
+
+
+# Upper bound on steps of one wave executing at the same time.
+MAX_PARALLEL_STEPS = 4
+
+
+def _plan_waves(plan: Plan) -> List[List[PlanStep]]:
+    """Group plan steps into waves whose steps depend only on earlier waves.
+
+    Steps keep their plan order within a wave. The plan is expected to be
+    acyclic (validate_plan rejects cycles); steps left on a cycle are dropped.
+    """
+    order = {step.step_id: index for index, step in enumerate(plan.steps)}
+    indegree = {step.step_id: len(set(step.depends_on) & order.keys()) for step in plan.steps}
+    dependents = _index_dependents(plan)
+    wave = [step for step in plan.steps if not indegree[step.step_id]]
+    waves: List[List[PlanStep]] = []
+    while wave:
+        waves.append(wave)
+        ready: List[str] = []
+        for step in wave:
+            for dependent_id in set(dependents.get(step.step_id, ())):
+                indegree[dependent_id] -= 1
+                if not indegree[dependent_id]:
+                    ready.append(dependent_id)
+        ready.sort(key=order.__getitem__)
+        wave = [plan.steps[order[step_id]] for step_id in ready]
+    return waves
+
+
+# type -> function returning a plain value for it: the class's model_dump for
+# pydantic models, identity for anything already plain. Filled on first sight.
+_DUMPERS: Dict[type, Callable[[Any], Any]] = {}
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _dump(value: Any) -> Any:
+    """model_dump() a pydantic model; return anything else unchanged."""
+    cls = type(value)
+    dumper = _DUMPERS.get(cls)
+    if dumper is None:
+        dumper = _DUMPERS[cls] = cls.model_dump if hasattr(cls, "model_dump") else _identity
+    return dumper(value)
+
+
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _is_plain(payload: Dict[str, Any]) -> bool:
+    """True when every value is a JSON primitive, so there is nothing to convert."""
+    return all(type(value) in _PLAIN_TYPES for value in payload.values())
+
 
+def _as_plan_model(plan: Any, plan_dict: Dict[str, Any]) -> Plan:
+    """Return the planner's Plan as is; validate plan_dict for planners returning other shapes."""
+    # A Plan from the planner already matches plan_dict; no need to validate it again.
+    if isinstance(plan, Plan):
+        return plan
+    return Plan.model_validate(plan_dict)
 
-def load_registry(tool_key: str) -> Dict[str, Any]:
-    """Load the operation registry for a given tool."""
-    registries_dir = Path(__file__).resolve().parent.parent / "registries"
-    registry_path = registries_dir / f"{tool_key}.json"
-    if not registry_path.exists():
-        raise FileNotFoundError(f"Registry not found for tool_key '{tool_key}' at {registry_path}")
-    with registry_path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+
+def _index_dependents(plan: Plan) -> Dict[str, List[str]]:
+    """Map each step_id to the steps that directly depend on it."""
+    dependents: Dict[str, List[str]] = defaultdict(list)
+    for step in plan.steps:
+        for dep in step.depends_on:
+            dependents[dep].append(step.step_id)
+    return dependents
 
 
 class OrchestratorService:
     """Coordinates planner, executor, and archivist interactions."""
 
-    def __init__(self, planner: Planner, executor: Executor, archivist: Archivist) -> None:
+    def __init__(
+        self,
+        planner: Planner,
+        executor: Executor,
+        archivist: Archivist,
+        registry_loader: Callable[[str], Mapping[str, Any]] = get_registry,
+    ) -> None:
         self.planner = planner
         self.executor = executor
         self.archivist = archivist
+        self.registry_loader = registry_loader
+        # Step decisions being waited on, keyed by (run_id, step_id).
+        self._pending_decisions: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def submit_step_decision(self, run_id: str, step_id: str, decision: Any) -> bool:
+        """Resolve the decision a run is waiting on for step_id.
+
+        Returns False when no such decision is pending (stale or unknown).
+        """
+        future = self._pending_decisions.get((run_id, step_id))
+        if future is None or future.done():
+            return False
+        future.set_result(decision)
+        return True
 
     def _to_serializable(self, value: Any) -> Any:
-        if isinstance(value, Enum):
-            return value.value
-        if hasattr(value, "model_dump"):
-            return value.model_dump()
-        if isinstance(value, dict):
-            return {k: self._to_serializable(v) for k, v in value.items()}
-        if isinstance(value, (list, tuple, set)):
-            return [self._to_serializable(v) for v in value]
-        return value
+        # pydantic-core walks models, enums and containers natively.
+        return to_jsonable_python(value)
 
     async def _emit(self, send_event: Callable[[Dict[str, Any]], Any], payload: Dict[str, Any]) -> None:
         """Emit an event, handling both sync and async send_event functions."""
-        serializable_payload = self._to_serializable(payload)
-        result = send_event(serializable_payload)
+        # Payloads with only primitive values (e.g. DEBUG) are sent as-is.
+        result = send_event(payload if _is_plain(payload) else self._to_serializable(payload))
         if inspect.iscoroutine(result):
             await result
 
+    async def _emit_exec_events(
+        self, send_event: Callable[[Dict[str, Any]], Any], run_id: str, payloads: List[Dict[str, Any]]
+    ) -> None:
+        """Emit buffered EXEC_EVENT payloads, as one EXEC_EVENT_BATCH when there are several."""
+        if len(payloads) == 1:
+            await self._emit(send_event, payloads[0])
+        else:
+            await self._emit(
+                send_event,
+                {"type": ExecutionEventType.EXEC_EVENT_BATCH.value, "run_id": run_id, "events": payloads},
+            )
+
     async def start_run(
         self,
         tool_key: str,
@@ -56,32 +157,35 @@ class OrchestratorService:
         user_context: Optional[Dict[str, Any]],
         send_event: Callable[[Dict[str, Any]], None],
         wait_for_user_message: Callable[[], Any],
-        wait_for_step_decision: Callable[[], Any],
+        fail_on_step_id: Optional[str] = None,
     ) -> RunResult:
         run_id = str(uuid.uuid4())
         
-        registry = load_registry(tool_key)
+        registry = self.registry_loader(tool_key)
         
         pre_state = self.executor.fetch_state(tool_key, user_context)
         
-        await self._emit(send_event, {"type": ExecutionEventType.RUN_CREATED, "run_id": run_id})
-        await self._emit(send_event, {"type": ExecutionEventType.DEBUG, "run_id": run_id, "message": "orchestrator skeleton ok"})
+        await self._emit(send_event, {"type": ExecutionEventType.RUN_CREATED.value, "run_id": run_id})
+        await self._emit(send_event, {"type": ExecutionEventType.DEBUG.value, "run_id": run_id, "message": "orchestrator skeleton ok"})
         
         conversation: list[Message] = []
         plan_dict: Optional[Dict[str, Any]] = None
         last_errors: Optional[list] = None
+        # Built once without validation: every field is already typed, and
+        # conversation is the live list the loops below append to.
+        planner_input = PlannerInput.model_construct(
+            tool_key=tool_key,
+            intent=intent,
+            operation_registry=registry,
+            pre_state=pre_state,
+            conversation=conversation,
+            validation_errors=None,
+        )
         
         for turn in range(10):
-            planner_input = PlannerInput(
-                tool_key=tool_key,
-                intent=intent,
-                operation_registry=registry,
-                pre_state=pre_state,
-                conversation=conversation,
-                validation_errors=last_errors
-            )
+            planner_input.validation_errors = last_errors
             
-            output = self.planner.next(planner_input)
+            output = await self.planner.next_async(planner_input)
             
             if output["type"] == "form":
                 # Planner requests user input via form:
@@ -96,7 +200,7 @@ class OrchestratorService:
                     "text": output["text"],
                     "fields": output["fields"],
                 }
-                await self._emit(send_event, {"type": ExecutionEventType.PLANNER_MESSAGE, "run_id": run_id, "message": message_dict})
+                await self._emit(send_event, {"type": ExecutionEventType.PLANNER_MESSAGE.value, "run_id": run_id, "message": message_dict})
                 user_response = await wait_for_user_message()
                 if isinstance(user_response, dict):
                     user_message = Message(**user_response)
@@ -109,12 +213,12 @@ class OrchestratorService:
                 # Planner returned a plan - break out of loop to proceed with validation
                 # Only after validation passes will we emit PLAN_ACCEPTED and start execution
                 plan = output["plan"]
-                plan_dict = plan.model_dump() if hasattr(plan, "model_dump") else plan
+                plan_dict = output.get("plan_dict") or _dump(plan)
                 break
             
             # Unexpected output type - log and continue (will timeout after 10 turns)
             await self._emit(send_event, {
-                "type": ExecutionEventType.DEBUG,
+                "type": ExecutionEventType.DEBUG.value,
                 "run_id": run_id,
                 "message": f"Unexpected planner output type: {output.get('type')}"
             })
@@ -143,19 +247,12 @@ class OrchestratorService:
         
         while validation_errors and correction_retries < max_correction_retries:
             errors_dict = [err.model_dump() for err in validation_errors]
-            await self._emit(send_event, {"type": ExecutionEventType.PLAN_INVALID, "run_id": run_id, "errors": errors_dict})
+            await self._emit(send_event, {"type": ExecutionEventType.PLAN_INVALID.value, "run_id": run_id, "errors": errors_dict})
             
             last_errors = validation_errors
-            planner_input = PlannerInput(
-                tool_key=tool_key,
-                intent=intent,
-                operation_registry=registry,
-                pre_state=pre_state,
-                conversation=conversation,
-                validation_errors=last_errors
-            )
+            planner_input.validation_errors = last_errors
             
-            output = self.planner.next(planner_input)
+            output = await self.planner.next_async(planner_input)
             
             if output["type"] == "form":
                 # Normalized form structure: {role, type, text, fields}
@@ -165,7 +262,7 @@ class OrchestratorService:
                     "text": output["text"],
                     "fields": output["fields"],
                 }
-                await self._emit(send_event, {"type": ExecutionEventType.PLANNER_MESSAGE, "run_id": run_id, "message": message_dict})
+                await self._emit(send_event, {"type": ExecutionEventType.PLANNER_MESSAGE.value, "run_id": run_id, "message": message_dict})
                 user_response = await wait_for_user_message()
                 if isinstance(user_response, dict):
                     user_message = Message(**user_response)
@@ -177,7 +274,7 @@ class OrchestratorService:
             if output["type"] == "plan":
                 # Normalized plan structure: {role, type, plan}
                 plan = output["plan"]
-                plan_dict = plan.model_dump() if hasattr(plan, "model_dump") else plan
+                plan_dict = output.get("plan_dict") or _dump(plan)
                 validation_errors = validate_plan(plan_dict, registry)
                 correction_retries += 1
             else:
@@ -203,155 +300,160 @@ class OrchestratorService:
                 ],
             )
         
-        plan_model = Plan(**plan_dict)
-        await self._emit(send_event, {"type": ExecutionEventType.PLAN_ACCEPTED, "run_id": run_id, "plan": plan_dict})
+        plan_model = _as_plan_model(plan, plan_dict)
+        dependents = _index_dependents(plan_model)
+        await self._emit(send_event, {"type": ExecutionEventType.PLAN_ACCEPTED.value, "run_id": run_id, "plan": plan_dict})
         
         skipped_steps: Set[str] = set()
         exec_trace: list[ExecEvent] = []
+        # model_dump() of each exec_trace entry, kept from emission for the archive.
+        exec_trace_dicts: list[Dict[str, Any]] = []
         aborted = False
-        fail_on_step_id = (user_context or {}).get("fail_on_step_id")
+        if fail_on_step_id is None:
+            fail_on_step_id = (user_context or {}).get("fail_on_step_id")
         await self._emit(
             send_event,
             {
-                "type": ExecutionEventType.DEBUG,
+                "type": ExecutionEventType.DEBUG.value,
                 "run_id": run_id,
                 "message": f"fail_on_step_id resolved to {fail_on_step_id!r}",
             },
         )
         
-        while True:
-            need_replan = False
-            step_index = 0
-            
-            while step_index < len(plan_model.steps):
-                if aborted:
-                    break
-                
-                current_step = plan_model.steps[step_index]
-                if current_step.step_id in skipped_steps:
-                    step_index += 1
-                    continue
-                
-                if any(dep in skipped_steps for dep in current_step.depends_on):
-                    skipped_steps.add(current_step.step_id)
-                    step_index += 1
+        step_slots = asyncio.Semaphore(MAX_PARALLEL_STEPS)
+        # Sibling steps can fail concurrently; only one NEED_STEP_DECISION is
+        # outstanding at a time, as the client shows a single decision prompt.
+        decision_lock = asyncio.Lock()
+        need_replan = False
+        
+        def skip_step(step_id: str) -> None:
+            # A step depending on a skipped step can never run, so the skip is
+            # propagated downstream here rather than re-derived per step later.
+            pending = deque([step_id])
+            while pending:
+                step_id = pending.popleft()
+                if step_id in skipped_steps:
                     continue
+                skipped_steps.add(step_id)
+                pending.extend(dependents.get(step_id, ()))
+        
+        async def run_single_step(current_step: PlanStep, wave_tasks: List[asyncio.Task]) -> None:
+            nonlocal aborted, need_replan, fail_on_step_id, plan_dict
+            retry_without_fail = False
+            step_completed = False
+            
+            while True:
+                context_to_use = user_context
+                if retry_without_fail and user_context:
+                    context_to_use = dict(user_context)
+                    context_to_use.pop("fail_on_step_id", None)
                 
-                retry_without_fail = False
-                step_completed = False
+                fail_target = None if retry_without_fail else (fail_on_step_id if fail_on_step_id == current_step.step_id else None)
+                failure_event: ExecEvent | None = None
+                step_done_event = False
+                pending_events: List[Dict[str, Any]] = []
                 
-                while True:
-                    context_to_use = user_context
-                    if retry_without_fail and user_context:
-                        context_to_use = dict(user_context)
-                        context_to_use.pop("fail_on_step_id", None)
-                    
-                    single_plan = Plan(
-                        plan_id=f"{plan_model.plan_id}_step_{current_step.step_id}",
-                        tool_key=tool_key,
-                        objective=f"Execute step {current_step.step_id}",
-                        steps=[current_step]
-                    )
-                    
-                    fail_target = None if retry_without_fail else (fail_on_step_id if fail_on_step_id == current_step.step_id else None)
-                    failure_event: ExecEvent | None = None
-                    step_done_event = False
-                    
-                    async for event in self.executor.execute_plan(
+                async with step_slots:
+                    async for event in self.executor.execute_step(
                         tool_key,
-                        single_plan,
+                        current_step,
                         user_context=context_to_use,
                         fail_on_step_id=fail_target,
                     ):
                         if event.type == ExecutionEventType.RUN_SUMMARY:
                             continue
-                        event_dict = event.model_dump() if hasattr(event, "model_dump") else event
-                        await self._emit(send_event, {"type": ExecutionEventType.EXEC_EVENT, "run_id": run_id, "event": event_dict})
+                        event_dict = _dump(event)
+                        pending_events.append({"type": ExecutionEventType.EXEC_EVENT.value, "run_id": run_id, "event": event_dict})
                         exec_trace.append(event)
+                        exec_trace_dicts.append(event_dict)
+                        if event.type in _FLUSH_EVENT_TYPES or len(pending_events) >= EXEC_EVENT_BATCH_MAX:
+                            await self._emit_exec_events(send_event, run_id, pending_events)
+                            pending_events = []
                         if event.type == ExecutionEventType.STEP_FAILED and event.step_id == current_step.step_id:
                             failure_event = event
                             break
                         if event.type == ExecutionEventType.STEP_DONE and event.step_id == current_step.step_id:
                             step_done_event = True
                     
-                    if failure_event is None:
-                        step_completed = step_done_event
-                        break
-                    
-                    error_dict = failure_event.error.model_dump() if failure_event.error and hasattr(failure_event.error, "model_dump") else (failure_event.error if failure_event.error else {})
-                    await self._emit(send_event, {"type": ExecutionEventType.NEED_STEP_DECISION, "run_id": run_id, "step_id": failure_event.step_id, "error": error_dict})
-                    
-                    # Wait for step decision and filter by step_id
-                    while True:
-                        decision_response = await wait_for_step_decision()
-                        if isinstance(decision_response, dict):
-                            if decision_response.get("run_id") == run_id and decision_response.get("step_id") == failure_event.step_id:
-                                decision = decision_response.get("decision")
-                                break
-                        else:
-                            # Fallback if not a dict
-                            decision = decision_response
-                            break
-                    
-                    if decision == StepDecision.ABORT_RUN:
-                        aborted = True
-                        break
-                    if decision == StepDecision.RETRY_STEP:
-                        retry_without_fail = True
-                        continue
-                    if decision == StepDecision.SKIP_STEP:
-                        skipped_steps.add(failure_event.step_id)
-                        if fail_on_step_id == failure_event.step_id:
-                            fail_on_step_id = None
-                        break
-                    if decision == StepDecision.SKIP_DEPENDENTS:
-                        skipped_steps.add(failure_event.step_id)
-                        for step in plan_model.steps:
-                            if failure_event.step_id in step.depends_on:
-                                skipped_steps.add(step.step_id)
-                        if fail_on_step_id == failure_event.step_id:
-                            fail_on_step_id = None
-                        break
-                    if decision == StepDecision.REPLAN:
-                        failure_msg = Message(
-                            role="assistant",
-                            type=MessageType.TEXT,
-                            text=f"Step {failure_event.step_id} failed: {failure_event.error.message if failure_event.error else 'Unknown error'}. Please provide a new plan."
-                        )
-                        conversation.append(failure_msg)
-                        plan_dict = None
-                        need_replan = True
-                        break
+                    if pending_events:
+                        await self._emit_exec_events(send_event, run_id, pending_events)
+                
+                if failure_event is None:
+                    step_completed = step_done_event
                     break
                 
+                error_dict = _dump(failure_event.error) if failure_event.error else {}
+                async with decision_lock:
+                    # Registered before asking, so submit_step_decision can resolve it.
+                    decision_key = (run_id, failure_event.step_id)
+                    decision_future = asyncio.get_running_loop().create_future()
+                    self._pending_decisions[decision_key] = decision_future
+                    try:
+                        await self._emit(send_event, {"type": ExecutionEventType.NEED_STEP_DECISION.value, "run_id": run_id, "step_id": failure_event.step_id, "error": error_dict})
+                        decision = await decision_future
+                    finally:
+                        del self._pending_decisions[decision_key]
+                
+                if decision == StepDecision.RETRY_STEP:
+                    retry_without_fail = True
+                    continue
+                if decision == StepDecision.ABORT_RUN:
+                    aborted = True
+                    break
+                if decision in (StepDecision.SKIP_STEP, StepDecision.SKIP_DEPENDENTS):
+                    skip_step(failure_event.step_id)
+                    if fail_on_step_id == failure_event.step_id:
+                        fail_on_step_id = None
+                    break
+                if decision == StepDecision.REPLAN:
+                    failure_msg = Message(
+                        role="assistant",
+                        type=MessageType.TEXT,
+                        text=f"Step {failure_event.step_id} failed: {failure_event.error.message if failure_event.error else 'Unknown error'}. Please provide a new plan."
+                    )
+                    conversation.append(failure_msg)
+                    plan_dict = None
+                    need_replan = True
+                    break
+                break
+            
+            if aborted or need_replan:
+                # The rest of the wave is moot once the run is aborted or replanned.
+                for task in wave_tasks:
+                    if task is not asyncio.current_task():
+                        task.cancel()
+                return
+            
+            if step_completed and fail_on_step_id == current_step.step_id:
+                fail_on_step_id = None
+        
+        while True:
+            need_replan = False
+            
+            for wave in _plan_waves(plan_model):
                 if aborted or need_replan:
                     break
                 
-                if current_step.step_id in skipped_steps:
-                    step_index += 1
-                    continue
+                runnable = [step for step in wave if step.step_id not in skipped_steps]
                 
-                if step_completed:
-                    if fail_on_step_id == current_step.step_id:
-                        fail_on_step_id = None
-                    step_index += 1
-                else:
-                    step_index += 1
+                wave_tasks: List[asyncio.Task] = []
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        for current_step in runnable:
+                            wave_tasks.append(tg.create_task(run_single_step(current_step, wave_tasks)))
+                except BaseExceptionGroup as group:
+                    # Surface a lone step error as itself, as the sequential loop did.
+                    if len(group.exceptions) == 1:
+                        raise group.exceptions[0] from None
+                    raise
             
             if aborted:
                 break
             
             if need_replan:
                 for turn in range(10):
-                    planner_input = PlannerInput(
-                        tool_key=tool_key,
-                        intent=intent,
-                        operation_registry=registry,
-                        pre_state=pre_state,
-                        conversation=conversation,
-                        validation_errors=None
-                    )
-                    output = self.planner.next(planner_input)
+                    planner_input.validation_errors = None
+                    output = await self.planner.next_async(planner_input)
                     if output["type"] == "form":
                         # Normalized form structure: {role, type, text, fields}
                         message_dict = {
@@ -360,7 +462,7 @@ class OrchestratorService:
                             "text": output["text"],
                             "fields": output["fields"],
                         }
-                        await self._emit(send_event, {"type": ExecutionEventType.PLANNER_MESSAGE, "run_id": run_id, "message": message_dict})
+                        await self._emit(send_event, {"type": ExecutionEventType.PLANNER_MESSAGE.value, "run_id": run_id, "message": message_dict})
                         user_response = await wait_for_user_message()
                         if isinstance(user_response, dict):
                             user_message = Message(**user_response)
@@ -371,15 +473,17 @@ class OrchestratorService:
                     if output["type"] == "plan":
                         # Normalized plan structure: {role, type, plan}
                         plan = output["plan"]
-                        plan_dict = plan.model_dump() if hasattr(plan, "model_dump") else plan
+                        plan_dict = output.get("plan_dict") or _dump(plan)
                         break
                 if plan_dict:
                     validation_errors = validate_plan(plan_dict, registry)
                     if not validation_errors:
-                        plan_model = Plan(**plan_dict)
-                        await self._emit(send_event, {"type": ExecutionEventType.PLAN_ACCEPTED, "run_id": run_id, "plan": plan_dict})
+                        plan_model = _as_plan_model(plan, plan_dict)
+                        dependents = _index_dependents(plan_model)
+                        await self._emit(send_event, {"type": ExecutionEventType.PLAN_ACCEPTED.value, "run_id": run_id, "plan": plan_dict})
                         skipped_steps.clear()
                         exec_trace.clear()
+                        exec_trace_dicts.clear()
                         continue
                 aborted = True
                 break
@@ -399,24 +503,27 @@ class OrchestratorService:
                 "total_steps": len(plan_model.steps),
             },
         )
+        summary_dict = summary_event.model_dump()
         await self._emit(
             send_event,
             {
                 "type": "EXEC_EVENT",
                 "run_id": run_id,
-                "event": summary_event.model_dump(),
+                "event": summary_dict,
             },
         )
         exec_trace.append(summary_event)
+        exec_trace_dicts.append(summary_dict)
         
         archive_payload = {
             "run_id": run_id,
             "tool_key": tool_key,
             "intent": intent,
             "registry_version": registry.get("version"),
-            "conversation": [msg.model_dump() if hasattr(msg, "model_dump") else msg for msg in conversation],
+            # Messages go to the archivist as models; it serializes them in one pass.
+            "conversation": list(conversation),
             "plan": plan_dict,
-            "exec_trace": [evt.model_dump() if hasattr(evt, "model_dump") else evt for evt in exec_trace],
+            "exec_trace": exec_trace_dicts,
             "pre_state": pre_state,
             "post_state": post_state,
             "status": final_status.value
@@ -424,11 +531,11 @@ class OrchestratorService:
         
         archive_ref = None
         try:
-            archive_result = self.archivist.store_run(archive_payload)
+            archive_result = await self.archivist.store_run_async(archive_payload)
             archive_ref = archive_result.get("archive_ref") if archive_result else None
         except Exception as e:
             await self._emit(send_event, {
-                "type": ExecutionEventType.DEBUG,
+                "type": ExecutionEventType.DEBUG.value,
                 "run_id": run_id,
                 "message": f"Archivist skipped: {e}"
             })
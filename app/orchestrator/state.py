@@ -1,5 +1,5 @@
+import time
 import uuid
-from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -10,7 +10,8 @@ from app.orchestrator.models import RunPhase, RunStatus
 class RunState(BaseModel):
     """State for a single orchestrator run."""
 
-    model_config = ConfigDict(extra="forbid")
+    # Updates assign fields in place; only the assigned field is validated.
+    model_config = ConfigDict(extra="forbid", validate_assignment=True)
 
     run_id: str
     tool_key: str
@@ -24,11 +25,12 @@ class RunState(BaseModel):
     validation_errors: List[Dict[str, Any]] = Field(default_factory=list)
     exec_trace: List[Dict[str, Any]] = Field(default_factory=list)
     step_status: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Unix epoch nanoseconds (time.time_ns), UTC by definition.
+    created_at: int = Field(default_factory=time.time_ns)
+    updated_at: int = Field(default_factory=time.time_ns)
 
     def touch(self) -> None:
-        self.updated_at = datetime.utcnow()
+        self.updated_at = time.time_ns()
 
 
 class InMemoryRunStore:
@@ -50,10 +52,10 @@ class InMemoryRunStore:
         state = self._runs.get(run_id)
         if state is None:
             raise KeyError(f"Run {run_id} not found")
-        updated = state.model_copy(update=updates)
-        updated.touch()
-        self._runs[run_id] = updated
-        return updated
+        for key, value in updates.items():
+            setattr(state, key, value)
+        state.touch()
+        return state
 
     def delete_run(self, run_id: str) -> None:
         self._runs.pop(run_id, None)
@@ -1,8 +1,11 @@
 import json
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-import jsonschema
+from jsonschema.exceptions import ValidationError as JsonSchemaValidationError
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 from app.orchestrator.models import ValidationError
 
@@ -19,20 +22,51 @@ def _load_plan_schema() -> Dict[str, Any]:
 PLAN_SCHEMA = _load_plan_schema()
 
 
+def _build_validator(schema: Mapping[str, Any]) -> Validator:
+    """Check a schema once and return a reusable validator for its draft."""
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+PLAN_VALIDATOR = _build_validator(PLAN_SCHEMA)
+
+# Per-registry op_id -> validator maps. Keyed by id(), so each entry keeps a
+# reference to its registry and is only reused for that same object.
+_OP_VALIDATORS: Dict[int, Tuple[Mapping[str, Any], Dict[str, Validator]]] = {}
+_OP_VALIDATORS_MAX = 32
+
+
+def _op_validators(registry: Mapping[str, Any]) -> Dict[str, Validator]:
+    cached = _OP_VALIDATORS.get(id(registry))
+    if cached is not None and cached[0] is registry:
+        return cached[1]
+    validators = {
+        op["op_id"]: _build_validator(op.get("input_schema", {}))
+        for op in registry.get("operations", [])
+    }
+    if len(_OP_VALIDATORS) >= _OP_VALIDATORS_MAX:
+        _OP_VALIDATORS.clear()
+    _OP_VALIDATORS[id(registry)] = (registry, validators)
+    return validators
+
+
 def _make_error(code: str, message: str, step_id: Optional[str] = None, path: Optional[str] = None, op_id: Optional[str] = None) -> ValidationError:
     return ValidationError(code=code, message=message, step_id=step_id, path=path, op_id=op_id)
 
 
-def validate_plan(plan_dict: Dict[str, Any], registry: Dict[str, Any]) -> List[ValidationError]:
+def _error_path(exc: JsonSchemaValidationError) -> str:
+    return "/".join(str(p) for p in exc.absolute_path)
+
+
+def validate_plan(plan_dict: Dict[str, Any], registry: Mapping[str, Any]) -> List[ValidationError]:
     """Validate a plan against schema, registry, params, dependencies, and limits."""
     errors: List[ValidationError] = []
 
     # 1. JSON schema validation
-    try:
-        jsonschema.validate(instance=plan_dict, schema=PLAN_SCHEMA)
-    except jsonschema.ValidationError as exc:
-        path_str = "/".join(str(p) for p in exc.path) if exc.path else ""
-        errors.append(_make_error("SCHEMA_INVALID", exc.message, path=path_str))
+    # Report every violation in one pass so the planner can fix them together.
+    for exc in PLAN_VALIDATOR.iter_errors(plan_dict):
+        errors.append(_make_error("SCHEMA_INVALID", exc.message, path=_error_path(exc)))
 
     steps: List[Dict[str, Any]] = plan_dict.get("steps", []) or []
 
@@ -40,67 +74,63 @@ def validate_plan(plan_dict: Dict[str, Any], registry: Dict[str, Any]) -> List[V
     if len(steps) > MAX_STEPS:
         errors.append(_make_error("LIMIT_EXCEEDED", f"Plan has {len(steps)} steps; max is {MAX_STEPS}", path="steps"))
 
-    # 3. Registry lookup
-    ops = {op["op_id"]: op for op in registry.get("operations", [])}
+    # 3. Registry lookup and params, in the same pass that indexes the steps
+    op_validators = _op_validators(registry)
+    step_deps: List[Tuple[Optional[str], List[str]]] = []
+    indegree: Dict[Optional[str], int] = {}
+    dependents: Dict[Optional[str], List[Optional[str]]] = {}
 
     for step in steps:
         step_id = step.get("step_id")
-        op_id = step.get("op_id")
+        step_deps.append((step_id, step.get("depends_on", []) or []))
+        indegree[step_id] = 0
+        dependents[step_id] = []
 
-        if op_id not in ops:
+        op_id = step.get("op_id")
+        validator = op_validators.get(op_id)
+        if validator is None:
             errors.append(_make_error("UNKNOWN_OPERATION", f"Operation '{op_id}' not found in registry", step_id=step_id, op_id=op_id))
             continue
 
-        op_schema = ops[op_id].get("input_schema", {})
-        try:
-            jsonschema.validate(instance=step.get("params", {}), schema=op_schema)
-        except jsonschema.ValidationError as exc:
-            path_str = "/".join(str(p) for p in exc.path) if exc.path else ""
-            errors.append(_make_error("INVALID_PARAMS", exc.message, step_id=step_id, path=path_str, op_id=op_id))
-
-    # 4. Dependency validation
-    step_ids = {s.get("step_id") for s in steps}
-    adjacency = {s.get("step_id"): s.get("depends_on", []) or [] for s in steps}
+        for exc in validator.iter_errors(step.get("params", {})):
+            errors.append(_make_error("INVALID_PARAMS", exc.message, step_id=step_id, path=_error_path(exc), op_id=op_id))
 
-    for step in steps:
-        step_id = step.get("step_id")
-        for dep in step.get("depends_on", []) or []:
-            if dep not in step_ids:
+    # 4. Dependency validation; needs every step id, so it follows the first
+    # pass and also builds the edges for cycle detection.
+    for step_id, deps in step_deps:
+        for dep in deps:
+            if dep not in dependents:
                 errors.append(_make_error("INVALID_DEPENDENCY", f"Dependency '{dep}' not found", step_id=step_id, path="depends_on"))
+                continue
             if dep == step_id:
                 errors.append(_make_error("INVALID_DEPENDENCY", "Step cannot depend on itself", step_id=step_id, path="depends_on"))
-
-    # cycle detection using DFS
-    visiting: set[str] = set()
-    visited: set[str] = set()
-
-    def dfs(node: Optional[str]) -> bool:
-        if node is None:
-            return False
-        if node in visiting:
-            return True
-        if node in visited:
-            return False
-        visiting.add(node)
-        for nxt in adjacency.get(node, []):
-            if dfs(nxt):
-                return True
-        visiting.remove(node)
-        visited.add(node)
-        return False
-
-    for node in list(adjacency.keys()):
-        if dfs(node):
-            errors.append(_make_error("INVALID_DEPENDENCY", "Cycle detected in dependencies", step_id=node, path="depends_on"))
-            break
+            dependents[dep].append(step_id)
+            indegree[step_id] += 1
+
+    # Cycle detection (Kahn): repeatedly release steps whose dependencies have
+    # all been released; anything left over is on or behind a cycle.
+    ready = deque(node for node, degree in indegree.items() if degree == 0)
+    released = 0
+    while ready:
+        node = ready.popleft()
+        released += 1
+        for nxt in dependents[node]:
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                ready.append(nxt)
+
+    if released < len(indegree):
+        node = next(node for node, degree in indegree.items() if degree > 0)
+        errors.append(_make_error("INVALID_DEPENDENCY", "Cycle detected in dependencies", step_id=node, path="depends_on"))
 
     return errors
 
 
 if __name__ == "__main__":
     # Tiny self-test
-    registry_path = Path(__file__).resolve().parent.parent / "registries" / "clickup.json"
-    registry = json.loads(registry_path.read_text(encoding="utf-8"))
+    from app.registries import get_registry
+
+    registry = get_registry("clickup")
 
     valid_plan = {
         "plan_id": "p1",
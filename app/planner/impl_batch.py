@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.config import settings
+from app.errors import VimaniError
+from app.planner.impl_llm import LLMPlanner
+from app.planner.interface import PlannerInput, PlannerOutput
+
+
+logger = logging.getLogger(__name__)
+
+
+BATCH_ENDPOINT = "/v1/responses"
+# Batch statuses after which nothing more will run.
+_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchLLMPlanner(LLMPlanner):
+    """LLM planner that can plan many inputs through the OpenAI Batch API.
+
+    Meant for offline callers (evaluation, backfills): batched requests are
+    billed at a lower rate but may take up to ``COMPLETION_WINDOW`` to finish.
+    Interactive turns still go through ``next``/``next_async``.
+    """
+
+    COMPLETION_WINDOW = "24h"
+    POLL_INTERVAL_S = 30.0
+    # Give up on a batch this long after submitting it; its requests are then
+    # planned interactively.
+    MAX_WAIT_S = 25 * 3600.0
+
+    def next_batch(self, inputs: List[PlannerInput]) -> List[PlannerOutput]:
+        """Plan every input, in order. Without VIMANI_PLANNER_BATCH this calls next() per input.
+
+        Blocks the calling thread while the batch runs, for up to
+        ``MAX_WAIT_S``; never call it on the event loop, use next_batch_async.
+        """
+        if not settings.planner_batch_mode:
+            return [self.next(planner_input) for planner_input in inputs]
+
+        results, payloads, positions, lines = self._prepare_batch(inputs)
+        if lines:
+            for custom_id, chunks in self._run_batch(b"".join(lines)).items():
+                index = positions[custom_id]
+                planner_input = inputs[index]
+                output = self._batch_output(planner_input, chunks)
+                if output is None:
+                    # Invalid batched output gets the interactive corrective retry.
+                    output = self._next_uncached(planner_input, payloads[custom_id])
+                self._response_cache_put(self._response_cache_key(planner_input, payloads[custom_id]), output)
+                results[index] = output
+            # Requests the batch returned nothing for are planned interactively.
+            for index, output in enumerate(results):
+                if output is None:
+                    results[index] = self.next(inputs[index])
+        return results
+
+    async def next_batch_async(self, inputs: List[PlannerInput]) -> List[PlannerOutput]:
+        """Same as next_batch(), polling with asyncio.sleep on the shared AsyncOpenAI client."""
+        if not settings.planner_batch_mode:
+            return [await self.next_async(planner_input) for planner_input in inputs]
+
+        results, payloads, positions, lines = self._prepare_batch(inputs)
+        if lines:
+            for custom_id, chunks in (await self._run_batch_async(b"".join(lines))).items():
+                index = positions[custom_id]
+                planner_input = inputs[index]
+                output = self._batch_output(planner_input, chunks)
+                if output is None:
+                    output = await self._next_async_uncached(planner_input, payloads[custom_id])
+                self._response_cache_put(self._response_cache_key(planner_input, payloads[custom_id]), output)
+                results[index] = output
+            for index, output in enumerate(results):
+                if output is None:
+                    results[index] = await self.next_async(inputs[index])
+        return results
+
+    def _prepare_batch(
+        self, inputs: List[PlannerInput]
+    ) -> Tuple[List[Any], Dict[str, Dict[str, Any]], Dict[str, int], List[bytes]]:
+        """Fill cached results and encode a batch request line for every other input."""
+        results: List[Any] = [None] * len(inputs)
+        payloads: Dict[str, Dict[str, Any]] = {}
+        positions: Dict[str, int] = {}
+        lines: List[bytes] = []
+        for index, planner_input in enumerate(inputs):
+            payload = self._build_payload(planner_input)
+            cached = self._response_cache_get(self._response_cache_key(planner_input, payload))
+            if cached is not None:
+                results[index] = cached
+                continue
+            custom_id = str(uuid.uuid4())
+            payloads[custom_id] = payload
+            positions[custom_id] = index
+            body = self._request_args(payload, None)
+            body.pop("stream")
+            lines.append(
+                orjson.dumps(
+                    {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+                    option=orjson.OPT_APPEND_NEWLINE,
+                )
+            )
+        return results, payloads, positions, lines
+
+    def _batch_output(self, planner_input: PlannerInput, chunks: List[str]) -> Optional[PlannerOutput]:
+        """Parse one batched response; None if it is invalid."""
+        try:
+            data = self._parse_content(chunks)
+            return self._process_llm_output(data, planner_input.tool_key, planner_input.intent)
+        except VimaniError:
+            return None
+
+    def _run_batch(self, jsonl: bytes) -> Dict[str, List[str]]:
+        """Submit one batch, wait for it, and return the output text by custom_id.
+
+        Requests that failed, or that the batch never ran (it failed, expired,
+        was cancelled or outlasted ``MAX_WAIT_S``), are logged and left out,
+        so next_batch plans them interactively.
+        """
+        client = self._client
+        try:
+            batch_file = client.files.create(file=("planner_batch.jsonl", jsonl), purpose="batch")
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window=self.COMPLETION_WINDOW,
+            )
+            deadline = time.monotonic() + self.MAX_WAIT_S
+            while batch.status not in _FINAL_STATUSES:
+                if time.monotonic() >= deadline:
+                    logger.warning("Planner batch %s still %s after %.0fs; cancelling it", batch.id, batch.status, self.MAX_WAIT_S)
+                    try:
+                        client.batches.cancel(batch.id)
+                    except Exception:  # pragma: no cover - integration edge
+                        logger.warning("Cancelling planner batch %s failed", batch.id, exc_info=True)
+                    return {}
+                time.sleep(self.POLL_INTERVAL_S)
+                batch = client.batches.retrieve(batch.id)
+            if batch.status != "completed":
+                logger.warning("Planner batch %s ended with status %s", batch.id, batch.status)
+            # An expired or cancelled batch still returns what it finished.
+            output_text = client.files.content(batch.output_file_id).text if batch.output_file_id else ""
+            error_text = client.files.content(batch.error_file_id).text if batch.error_file_id else ""
+        except Exception as exc:  # pragma: no cover - integration edge
+            raise self._call_failed(exc)
+        return _batch_outputs(output_text, error_text)
+
+    async def _run_batch_async(self, jsonl: bytes) -> Dict[str, List[str]]:
+        """Same as _run_batch(), awaiting the API and polling with asyncio.sleep."""
+        client = self._async_client
+        try:
+            batch_file = await client.files.create(file=("planner_batch.jsonl", jsonl), purpose="batch")
+            batch = await client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window=self.COMPLETION_WINDOW,
+            )
+            deadline = time.monotonic() + self.MAX_WAIT_S
+            while batch.status not in _FINAL_STATUSES:
+                if time.monotonic() >= deadline:
+                    logger.warning("Planner batch %s still %s after %.0fs; cancelling it", batch.id, batch.status, self.MAX_WAIT_S)
+                    try:
+                        await client.batches.cancel(batch.id)
+                    except Exception:  # pragma: no cover - integration edge
+                        logger.warning("Cancelling planner batch %s failed", batch.id, exc_info=True)
+                    return {}
+                await asyncio.sleep(self.POLL_INTERVAL_S)
+                batch = await client.batches.retrieve(batch.id)
+            if batch.status != "completed":
+                logger.warning("Planner batch %s ended with status %s", batch.id, batch.status)
+            output_text = (await client.files.content(batch.output_file_id)).text if batch.output_file_id else ""
+            error_text = (await client.files.content(batch.error_file_id)).text if batch.error_file_id else ""
+        except Exception as exc:  # pragma: no cover - integration edge
+            raise self._call_failed(exc)
+        return _batch_outputs(output_text, error_text)
+
+
+def _batch_outputs(output_text: str, error_text: str) -> Dict[str, List[str]]:
+    """Map custom_id to output text for each successful request; log the rest."""
+    for line in error_text.splitlines():
+        if line:
+            _log_failed_request(orjson.loads(line))
+
+    outputs: Dict[str, List[str]] = {}
+    for line in output_text.splitlines():
+        if not line:
+            continue
+        record = orjson.loads(line)
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            _log_failed_request(record)
+            continue
+        outputs[record["custom_id"]] = _output_text(response.get("body") or {})
+    return outputs
+
+
+def _log_failed_request(record: Dict[str, Any]) -> None:
+    logger.warning(
+        "Planner batch request %s failed: %s", record.get("custom_id"), record.get("error") or record.get("response")
+    )
+
+
+def _output_text(body: Dict[str, Any]) -> List[str]:
+    """Collect the output_text parts of a Responses API response body."""
+    return [
+        part.get("text", "")
+        for item in body.get("output", [])
+        if item.get("type") == "message"
+        for part in item.get("content", [])
+        if part.get("type") == "output_text"
+    ]
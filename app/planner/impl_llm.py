@@ -1,9 +1,17 @@
-import json
+import asyncio
+import hashlib
+import logging
 import uuid
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from openai import OpenAI
-from pydantic import ValidationError
+import httpx
+import orjson
+from jsonschema.exceptions import best_match
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from pydantic import TypeAdapter
 
 from app.config import settings
 from app.errors import VimaniError
@@ -14,24 +22,35 @@ from app.orchestrator.models import (
     Message,
     MessageField,
     MessageType,
+    OnFailAction,
     Plan,
+    PlanStep,
+    ValidationError,
 )
 from app.planner.interface import Planner, PlannerInput, PlannerOutput
 
 
+logger = logging.getLogger(__name__)
+
+
 SYSTEM_PROMPT = (
     "You are a planner. Return JSON only. Output must be either:\n"
     "1) {'role':'assistant','type':'form','text':..., 'fields':[{'key':'<string>','label':'<string>','type':'text|number|select|textarea','required':true|false,'placeholder':null|'<string>','options':[]}...]}\n"
     "2) {'role':'assistant','type':'plan','plan': {'plan_id':'<string>','tool_key':'<string>','objective':'<string>','steps':[{'step_id':'S1','op_id':'<string>','params':{},'depends_on':[]}]}}\n"
-    "For plans: params must always be present (use {} if none). step_id like 'S1','S2', depends_on as list of step_ids."
+    "For plans: params must always be present (use {} if none). step_id like 'S1','S2', depends_on as list of step_ids.\n"
+    "The first user message gives tool_key and operation_registry; the second gives intent, conversation, pre_state and validation_errors."
 )
 
 
+FORM_FIELD_TYPES = ("text", "number", "select", "textarea")
+
+
 PLANNER_OUTPUT_SCHEMA: Dict[str, Any] = {
     "name": "planner_output",
     "schema": {
         "type": "object",
         "properties": {
+            "role": {"type": "string", "enum": ["assistant"]},
             "type": {"type": "string", "enum": ["form", "plan"]},
             "text": {"type": "string"},
             "fields": {
@@ -43,7 +62,7 @@ PLANNER_OUTPUT_SCHEMA: Dict[str, Any] = {
                     "properties": {
                         "key": {"type": "string"},
                         "label": {"type": "string"},
-                        "type": {"type": "string", "enum": ["text", "number", "select", "textarea"]},
+                        "type": {"type": "string", "enum": list(FORM_FIELD_TYPES)},
                         "required": {"type": "boolean"},
                         "placeholder": {"type": ["string", "null"]},
                         "options": {
@@ -80,7 +99,7 @@ PLANNER_OUTPUT_SCHEMA: Dict[str, Any] = {
                                     "items": {"type": "string"},
                                     "default": [],
                                 },
-                                "on_fail": {"type": "string"},
+                                "on_fail": {"type": "string", "enum": [action.value for action in OnFailAction]},
                             },
                             "required": ["step_id", "op_id", "params"],
                             "additionalProperties": False,
@@ -91,71 +110,184 @@ PLANNER_OUTPUT_SCHEMA: Dict[str, Any] = {
                 "additionalProperties": False,
             },
         },
-        "required": ["type"],
+        "required": ["role", "type"],
         "additionalProperties": False,
     },
+    # Step params are free-form objects, which strict mode cannot express, so
+    # the schema guides generation and _process_llm_output still checks it.
+    "strict": False,
 }
 
 
+def _build_output_validator() -> Validator:
+    schema = PLANNER_OUTPUT_SCHEMA["schema"]
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+# Compiled once; every planner response is checked against it in one pass.
+_OUTPUT_VALIDATOR = _build_output_validator()
+
+
+# Encode whole lists in one pydantic-core call rather than per model.
+_CONVERSATION_ADAPTER = TypeAdapter(List[Message])
+_VALIDATION_ERRORS_ADAPTER = TypeAdapter(List[ValidationError])
+
+
+# Process-wide clients, so every planner shares one keep-alive connection pool
+# instead of paying DNS and TLS setup per instance. The SDK's default httpx
+# clients keep its timeouts and redirect settings; only the pool size changes.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+_CLIENT: Optional[OpenAI] = None
+# An AsyncOpenAI client's connections belong to the loop that opened them, so
+# there is one client per event loop, keyed by id() with the loop held.
+_ASYNC_CLIENTS: Dict[int, Tuple[asyncio.AbstractEventLoop, AsyncOpenAI]] = {}
+
+
+def _get_client() -> OpenAI:
+    global _CLIENT
+    if _CLIENT is None:
+        # This will raise a structured ErrorEnvelope if the API key is missing.
+        _CLIENT = OpenAI(api_key=settings.openai_api_key, http_client=DefaultHttpxClient(limits=_HTTP_LIMITS))
+    return _CLIENT
+
+
+def _get_async_client() -> AsyncOpenAI:
+    """Return the AsyncOpenAI client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    cached = _ASYNC_CLIENTS.get(id(loop))
+    if cached is not None and cached[0] is loop:
+        return cached[1]
+    # Drop clients of loops that have since closed (asyncio.run per call, tests).
+    for key, (other_loop, _) in list(_ASYNC_CLIENTS.items()):
+        if other_loop.is_closed():
+            del _ASYNC_CLIENTS[key]
+    client = AsyncOpenAI(
+        api_key=settings.openai_api_key, http_client=DefaultAsyncHttpxClient(limits=_HTTP_LIMITS)
+    )
+    _ASYNC_CLIENTS[id(loop)] = (loop, client)
+    return client
+
+
+# The registry goes to the model as its own leading message, byte-identical
+# for every call on that registry, so the API's prompt cache can reuse it.
+# Encoded once per registry object (keyed by id() with a reference held, as
+# in app.orchestrator.validation).
+_REGISTRY_PREFIXES: Dict[Tuple[str, int], Tuple[Mapping[str, Any], str]] = {}
+_REGISTRY_PREFIXES_MAX = 32
+
+# Payload keys sent per call, after the registry prefix.
+_TURN_KEYS = ("intent", "conversation", "pre_state", "validation_errors")
+
+
+def _registry_prefix(tool_key: str, registry: Mapping[str, Any]) -> str:
+    cached = _REGISTRY_PREFIXES.get((tool_key, id(registry)))
+    if cached is not None and cached[0] is registry:
+        return cached[1]
+    prefix = orjson.dumps(
+        {"tool_key": tool_key, "operation_registry": dict(registry)}, option=orjson.OPT_SORT_KEYS
+    ).decode()
+    if len(_REGISTRY_PREFIXES) >= _REGISTRY_PREFIXES_MAX:
+        _REGISTRY_PREFIXES.clear()
+    _REGISTRY_PREFIXES[(tool_key, id(registry))] = (registry, prefix)
+    return prefix
+
+
+def _turn_content(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: payload[key] for key in _TURN_KEYS}
+
+
+# Validated planner outputs keyed by a digest of the request payload, so a
+# repeated turn (same intent, conversation, registry and state) skips the API
+# call. Turns correcting validation errors are not cached. Entries are shared
+# between callers and must not be mutated.
+RESPONSE_CACHE_MAX = 1024
+_RESPONSE_CACHE: "OrderedDict[bytes, PlannerOutput]" = OrderedDict()
+
+
+# Planner error envelopes differ only in their message, so each is copied from
+# a template instead of being validated again.
+_INVALID_OUTPUT_ENVELOPE = ErrorEnvelope.model_construct(
+    code="PLANNER_INVALID_OUTPUT",
+    message="",
+    source=ErrorSource.PLANNER,
+    severity=ErrorSeverity.RUN,
+    step_id=None,
+    retryable=True,
+)
+_CALL_FAILED_ENVELOPE = _INVALID_OUTPUT_ENVELOPE.model_copy(update={"code": "PLANNER_LLM_CALL_FAILED"})
+
+
 class LLMPlanner(Planner):
     """Planner implementation backed by the OpenAI Responses API."""
 
     def __init__(self) -> None:
-        # This will raise a structured ErrorEnvelope if the API key is missing.
-        api_key = settings.openai_api_key
-        self._client = OpenAI(api_key=api_key)
+        self._client = _get_client()
+
+    @property
+    def _async_client(self) -> AsyncOpenAI:
+        """The shared AsyncOpenAI client for the running event loop."""
+        return _get_async_client()
 
     def _raise_output_error(self, message: str) -> None:
-        raise VimaniError(
-            ErrorEnvelope(
-                code="PLANNER_INVALID_OUTPUT",
-                message=message,
-                source=ErrorSource.PLANNER,
-                severity=ErrorSeverity.RUN,
-                retryable=True,
-            )
-        )
+        raise VimaniError(_INVALID_OUTPUT_ENVELOPE.model_copy(update={"message": message}))
 
-    def _call_openai(self, payload: Dict[str, Any], corrective_message: str | None = None) -> Dict[str, Any]:
-        # Minimal runtime log to confirm which model is being used.
-        print("LLMPlanner calling model=", settings.planner_model)
-        print("LLM sanity test: calling OpenAI")
+    def _request_args(self, payload: Dict[str, Any], corrective_message: str | None) -> Dict[str, Any]:
+        model = payload["model"]
+        logger.debug("LLMPlanner calling model=%s", model)
         
         system_content = SYSTEM_PROMPT
         if corrective_message:
             system_content = f"{SYSTEM_PROMPT}\n\nCORRECTIVE INSTRUCTION: {corrective_message}"
         
-        try:
-            response = self._client.responses.create(
-                model=settings.planner_model,
-                input=[
-                    {"role": "system", "content": system_content},
-                    {"role": "user", "content": json.dumps(payload)},
-                ],
-                text={
-                    "format": {"type": "json_object"}
-                },
-            )
-        except Exception as exc:  # pragma: no cover - integration edge
-            raise VimaniError(
-                ErrorEnvelope(
-                    code="PLANNER_LLM_CALL_FAILED",
-                    message=f"Planner LLM call failed: {exc}",
-                    source=ErrorSource.PLANNER,
-                    severity=ErrorSeverity.RUN,
-                    retryable=True,
-                )
-            )
+        # Streamed so the body is read as it is generated; the deltas are
+        # joined and parsed once the response completes.
+        return {
+            "model": model,
+            "input": [
+                {"role": "system", "content": system_content},
+                {"role": "user", "content": _registry_prefix(payload["tool_key"], payload["operation_registry"])},
+                {"role": "user", "content": orjson.dumps(_turn_content(payload)).decode()},
+            ],
+            "text": {
+                "format": {"type": "json_schema", **PLANNER_OUTPUT_SCHEMA}
+            },
+            "stream": True,
+        }
+
+    def _select_model(self, input: PlannerInput) -> str:
+        """Pick planner_model_small for simple turns, when one is configured."""
+        small_model = settings.planner_model_small
+        if small_model is None or input.validation_errors:
+            return settings.planner_model
+        conversation = input.conversation
+        # Before the user has answered, the turn is the intake form.
+        if not any(msg.role == "user" for msg in conversation):
+            return small_model
+        score = len(conversation) + len(input.operation_registry.get("operations", []))
+        return small_model if score < settings.planner_small_max_score else settings.planner_model
+
+    def _collect_event(self, event: Any, chunks: List[str]) -> None:
+        if event.type == "response.output_text.delta":
+            chunks.append(event.delta)
+        elif event.type == "response.failed":
+            error = event.response.error
+            raise RuntimeError(error.message if error else "response failed")
+        elif event.type == "response.incomplete":
+            # e.g. the output-token cap was hit: the text so far is truncated.
+            details = event.response.incomplete_details
+            raise RuntimeError(f"response incomplete: {details.reason if details else 'unknown reason'}")
+        elif event.type == "error":
+            raise RuntimeError(event.message)
 
+    def _call_failed(self, exc: Exception) -> VimaniError:
+        return VimaniError(_CALL_FAILED_ENVELOPE.model_copy(update={"message": f"Planner LLM call failed: {exc}"}))
+
+    def _parse_content(self, chunks: List[str]) -> Dict[str, Any]:
         try:
-            # Parse JSON from text response (not parsed)
-            text_content = response.output[0].content[0].text  # type: ignore[attr-defined]
-            if hasattr(text_content, 'value'):
-                json_str = text_content.value
-            else:
-                json_str = str(text_content)
-            content = json.loads(json_str)
-        except (json.JSONDecodeError, Exception) as exc:  # pragma: no cover - defensive
+            content = orjson.loads("".join(chunks))
+        except orjson.JSONDecodeError as exc:
             self._raise_output_error(
                 f"Planner LLM returned invalid JSON: {exc}"
             )
@@ -165,112 +297,100 @@ class LLMPlanner(Planner):
 
         return content
 
-    def _build_payload(self, input: PlannerInput) -> Dict[str, Any]:
-        conversation_payload: List[Dict[str, Any]] = [
-            msg.model_dump() if hasattr(msg, "model_dump") else msg  # type: ignore[arg-type]
-            for msg in input.conversation
-        ]
+    def _call_openai(self, payload: Dict[str, Any], corrective_message: str | None = None) -> Dict[str, Any]:
+        request = self._request_args(payload, corrective_message)
+        chunks: List[str] = []
+        try:
+            for event in self._client.responses.create(**request):
+                self._collect_event(event, chunks)
+        except Exception as exc:  # pragma: no cover - integration edge
+            raise self._call_failed(exc)
+        return self._parse_content(chunks)
+
+    async def _call_openai_async(self, payload: Dict[str, Any], corrective_message: str | None = None) -> Dict[str, Any]:
+        # The request body is encoded before the first await.
+        request = self._request_args(payload, corrective_message)
+        chunks: List[str] = []
+        try:
+            stream = await self._async_client.responses.create(**request)
+            async for event in stream:
+                self._collect_event(event, chunks)
+        except Exception as exc:  # pragma: no cover - integration edge
+            raise self._call_failed(exc)
+        return self._parse_content(chunks)
 
+    def _build_payload(self, input: PlannerInput) -> Dict[str, Any]:
         return {
             "tool_key": input.tool_key,
             "intent": input.intent,
-            "conversation": conversation_payload,
+            # Encoded straight to JSON bytes by pydantic-core; orjson splices
+            # them in when the turn message is built, with no dicts in between.
+            "conversation": orjson.Fragment(_CONVERSATION_ADAPTER.dump_json(input.conversation)),
+            # Not copied: it is encoded once per registry by _registry_prefix.
             "operation_registry": input.operation_registry,
             "pre_state": input.pre_state,
-            "validation_errors": [
-                err.model_dump() if hasattr(err, "model_dump") else err  # type: ignore[arg-type]
-                for err in (input.validation_errors or [])
-            ],
+            "validation_errors": orjson.Fragment(_VALIDATION_ERRORS_ADAPTER.dump_json(input.validation_errors or [])),
+            # Not sent (see _TURN_KEYS); picked here while the models are at hand.
+            "model": self._select_model(input),
         }
 
-    def _validate_form_fields(self, fields_raw: Any) -> List[MessageField]:
-        """Manually validate form fields shape."""
+    def _validate_form_fields(self, fields_raw: Any) -> List[Dict[str, Any]]:
+        """Check the form has fields; their shape was already checked against PLANNER_OUTPUT_SCHEMA."""
         if not isinstance(fields_raw, list):
             self._raise_output_error("Planner form output must include 'fields' as a list.")
         
         if not fields_raw:
             self._raise_output_error("Planner form output must include at least one field in 'fields'.")
         
-        fields: List[MessageField] = []
-        for idx, field in enumerate(fields_raw):
-            if not isinstance(field, dict):
-                self._raise_output_error(
-                    f"Planner form field at index {idx} must be an object."
-                )
-            
-            # --- v0 canonical: require only label + type. key/required can be defaulted/mapped ---
-            required_keys = {"label", "type"}
-            missing_keys = required_keys - set(field.keys())
-            if missing_keys:
-                self._raise_output_error(
-                    f"Planner form field at index {idx} missing required keys: {missing_keys}"
-                )
-
-            # Accept 'id' as an alias for 'key'
-            if "key" not in field and "id" in field:
-                field["key"] = field["id"]
-
-            # Default required if missing
-            if "required" not in field:
-                field["required"] = False
-
-            # Default placeholder/options if missing
-            if "placeholder" not in field:
-                field["placeholder"] = None
-            if "options" not in field:
-                field["options"] = []
-
-            # Validate key types (key can come from id mapping above)
-            if "key" not in field:
-                self._raise_output_error(f"Planner form field at index {idx}: must have 'key' or 'id'.")
-            if not isinstance(field.get("key"), str):
-                self._raise_output_error(f"Planner form field at index {idx}: 'key' must be a string.")
-            if not isinstance(field.get("label"), str):
-                self._raise_output_error(f"Planner form field at index {idx}: 'label' must be a string.")
-            if not isinstance(field.get("type"), str):
-                self._raise_output_error(f"Planner form field at index {idx}: 'type' must be a string.")
-            if field.get("type") not in ("text", "number", "select", "textarea"):
-                self._raise_output_error(
-                    f"Planner form field at index {idx}: 'type' must be one of: text, number, select, textarea"
-                )
-            if not isinstance(field.get("required"), bool):
-                self._raise_output_error(f"Planner form field at index {idx}: 'required' must be a boolean.")
-            if field.get("placeholder") is not None and not isinstance(field.get("placeholder"), str):
-                self._raise_output_error(f"Planner form field at index {idx}: 'placeholder' must be a string or null.")
-            if not isinstance(field.get("options"), list):
-                self._raise_output_error(f"Planner form field at index {idx}: 'options' must be an array.")
-            
-            # Validate options if present
-            options = field.get("options", [])
-            for opt_idx, option in enumerate(options):
-                if not isinstance(option, dict):
-                    self._raise_output_error(
-                        f"Planner form field at index {idx}, option at index {opt_idx}: must be an object."
-                    )
-                if "id" not in option or "label" not in option:
-                    self._raise_output_error(
-                        f"Planner form field at index {idx}, option at index {opt_idx}: must have 'id' and 'label'."
-                    )
-                if not isinstance(option.get("id"), str) or not isinstance(option.get("label"), str):
-                    self._raise_output_error(
-                        f"Planner form field at index {idx}, option at index {opt_idx}: 'id' and 'label' must be strings."
-                    )
-            
-            try:
-                fields.append(MessageField.model_validate(field))
-            except ValidationError as exc:
-                self._raise_output_error(
-                    f"Planner form field at index {idx} validation failed: {exc}"
-                )
-        
-        if not fields:
-            self._raise_output_error("Planner form output must include at least one valid field in 'fields'.")
-        
-        return fields
+        # The schema pins every MessageField key and type, and _normalize_output
+        # filled the defaults, so the dicts already match MessageField.model_dump().
+        return fields_raw
+
+    def _response_cache_key(self, input: PlannerInput, payload: Dict[str, Any]) -> Optional[bytes]:
+        if input.validation_errors:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(_registry_prefix(payload["tool_key"], payload["operation_registry"]).encode())
+        digest.update(orjson.dumps(_turn_content(payload), option=orjson.OPT_SORT_KEYS))
+        return digest.digest()
+
+    def _response_cache_get(self, key: Optional[bytes]) -> Optional[PlannerOutput]:
+        if key is None:
+            return None
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is not None:
+            _RESPONSE_CACHE.move_to_end(key)
+        return cached
+
+    def _response_cache_put(self, key: Optional[bytes], output: PlannerOutput) -> None:
+        if key is None:
+            return
+        _RESPONSE_CACHE[key] = output
+        if len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX:
+            _RESPONSE_CACHE.popitem(last=False)
 
     def next(self, input: PlannerInput) -> PlannerOutput:
         payload = self._build_payload(input)
-        
+        cache_key = self._response_cache_key(input, payload)
+        cached = self._response_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        result = self._next_uncached(input, payload)
+        self._response_cache_put(cache_key, result)
+        return result
+
+    async def next_async(self, input: PlannerInput) -> PlannerOutput:
+        """Same as next(), awaiting the API on the shared AsyncOpenAI client."""
+        payload = self._build_payload(input)
+        cache_key = self._response_cache_key(input, payload)
+        cached = self._response_cache_get(cache_key)
+        if cached is not None:
+            return cached
+        result = await self._next_async_uncached(input, payload)
+        self._response_cache_put(cache_key, result)
+        return result
+
+    def _next_uncached(self, input: PlannerInput, payload: Dict[str, Any]) -> PlannerOutput:
         # Try once, then retry with corrective message if validation fails
         try:
             data = self._call_openai(payload)
@@ -283,83 +403,119 @@ class LLMPlanner(Planner):
             return self._process_llm_output(data, input.tool_key, input.intent)
         except VimaniError as ve:
             # Retry once with corrective message
-            corrective_msg = f"Previous output was invalid: {ve.envelope.message if hasattr(ve, 'envelope') else str(ve)}. Please ensure the output matches the required format exactly."
             try:
-                data = self._call_openai(payload, corrective_message=corrective_msg)
+                data = self._call_openai(payload, corrective_message=self._corrective_message(ve))
                 return self._process_llm_output(data, input.tool_key, input.intent)
             except VimaniError:
                 # If retry also fails, raise the original error
                 raise ve
 
+    async def _next_async_uncached(self, input: PlannerInput, payload: Dict[str, Any]) -> PlannerOutput:
+        # If the LLM call itself fails, don't retry
+        data = await self._call_openai_async(payload)
+        try:
+            return self._process_llm_output(data, input.tool_key, input.intent)
+        except VimaniError as ve:
+            try:
+                data = await self._call_openai_async(payload, corrective_message=self._corrective_message(ve))
+                return self._process_llm_output(data, input.tool_key, input.intent)
+            except VimaniError:
+                raise ve
+
+    def _corrective_message(self, error: VimaniError) -> str:
+        return f"Previous output was invalid: {error}. Please ensure the output matches the required format exactly."
+
+    def _normalize_output(self, data: Dict[str, Any]) -> None:
+        """Fill in what the model may leave out before schema validation."""
+        data.setdefault("role", "assistant")
+
+        if data.get("type") == "form":
+            fields = data.get("fields")
+            if isinstance(fields, list):
+                for field in fields:
+                    if not isinstance(field, dict):
+                        continue
+                    # Accept 'id' as an alias for 'key'
+                    if "key" not in field and "id" in field:
+                        field["key"] = field.pop("id")
+                    field.setdefault("required", False)
+                    field.setdefault("placeholder", None)
+                    field.setdefault("options", [])
+            return
+
+        # Check if output contains only {"steps": ...} at top level (no "plan" key)
+        if not isinstance(data.get("plan"), dict) and "steps" in data:
+            data["plan"] = {"steps": data.pop("steps")}
+
+        plan_obj = data.get("plan")
+        if not isinstance(plan_obj, dict):
+            return
+        # Ensure required Plan fields are present with defaults
+        plan_obj.setdefault("plan_id", str(uuid.uuid4()))
+        plan_obj.setdefault("tool_key", "clickup")
+        plan_obj.setdefault("objective", "")
+        # Ensure all steps have params
+        steps = plan_obj.get("steps")
+        if isinstance(steps, list):
+            for step in steps:
+                if isinstance(step, dict):
+                    step.setdefault("params", {})
+                    step.setdefault("depends_on", [])
+                    step.setdefault("on_fail", OnFailAction.SKIP_DEPENDENTS.value)
+
     def _process_llm_output(self, data: Dict[str, Any], tool_key: str, intent: str) -> PlannerOutput:
         """Process and validate LLM output."""
-        output_type = data.get("type")
-        if output_type not in ("form", "plan"):
-            self._raise_output_error(
-                f"Planner LLM output must have type 'form' or 'plan', got: {output_type}"
-            )
+        self._normalize_output(data)
+        error = best_match(_OUTPUT_VALIDATOR.iter_errors(data))
+        if error is not None:
+            path = "/".join(str(p) for p in error.absolute_path) or "<root>"
+            self._raise_output_error(f"Planner LLM output invalid at {path}: {error.message}")
 
-        if output_type == "form":
+        if data["type"] == "form":
             text = data.get("text")
-            if not isinstance(text, str):
-                self._raise_output_error("Planner form output must include 'text' as a string.")
-            
             # Ensure text is non-empty, use default if empty
             if not text or not text.strip():
                 text = "Please provide the following details."
 
-            # Validate fields manually
-            fields = self._validate_form_fields(data.get("fields"))
+            fields_dict = self._validate_form_fields(data.get("fields"))
 
             # Normalize to consistent structure
-            fields_dict = [field.model_dump() if hasattr(field, "model_dump") else field for field in fields]
             result = {
                 "role": "assistant",
                 "type": "form",
                 "text": text,
                 "fields": fields_dict,
             }
-            print("LLMPlanner output:", result)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("LLMPlanner output: %r", result)
             return result
 
         # type == "plan"
         plan_obj = data.get("plan")
-        
-        # Check if output contains only {"steps": ...} at top level (no "plan" key)
-        if not isinstance(plan_obj, dict) and "steps" in data:
-            plan_obj = {"steps": data["steps"]}
-        
-        if not isinstance(plan_obj, dict):
+        if plan_obj is None:
             self._raise_output_error("Planner plan output must include 'plan' as an object or 'steps' array.")
-        
-        # Ensure required Plan fields are present with defaults
-        if "plan_id" not in plan_obj:
-            plan_obj["plan_id"] = str(uuid.uuid4())
-        if "tool_key" not in plan_obj:
-            plan_obj["tool_key"] = "clickup"
-        if "objective" not in plan_obj:
-            plan_obj["objective"] = ""
-        
-        # Ensure all steps have params
-        steps = plan_obj.get("steps", [])
-        if isinstance(steps, list):
-            for step in steps:
-                if isinstance(step, dict) and "params" not in step:
-                    step["params"] = {}
-        
-        try:
-            plan = Plan.model_validate(plan_obj)
-        except ValidationError as exc:
-            self._raise_output_error(
-                f"Planner LLM returned an invalid plan object: {exc}"
-            )
+
+        # Built without re-validation: the schema already accepted plan_obj
+        # and constrains each field at least as tightly as the models do.
+        plan = Plan.model_construct(
+            plan_id=plan_obj["plan_id"],
+            tool_key=plan_obj["tool_key"],
+            objective=plan_obj["objective"],
+            steps=[
+                PlanStep.model_construct(**{**step, "on_fail": OnFailAction(step["on_fail"])})
+                for step in plan_obj["steps"]
+            ],
+        )
 
         # Normalize to consistent structure
         result = {
             "role": "assistant",
             "type": "plan",
             "plan": plan,
+            # plan_obj now carries every Plan field, so callers can use it as
+            # the plan's dict form instead of dumping the model again.
+            "plan_dict": plan_obj,
         }
-        print("LLMPlanner output:", result)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("LLMPlanner output: %r", result)
         return result
-
@@ -4,41 +4,46 @@ from app.orchestrator.models import Message, MessageField, MessageType, Plan, Pl
 from app.planner.interface import Planner, PlannerInput, PlannerOutput
 
 
+# The intake form never changes, so its fields are built once (without
+# validation, as they are literals) and shared by every form message.
+_INTAKE_FORM_FIELDS = (
+    MessageField.model_construct(
+        key="team_size",
+        label="Team size",
+        type="number",
+        required=True,
+        placeholder="e.g. 5",
+    ),
+    MessageField.model_construct(
+        key="priority",
+        label="Overall priority",
+        type="select",
+        required=True,
+        options=[
+            {"id": "low", "label": "Low"},
+            {"id": "medium", "label": "Medium"},
+            {"id": "high", "label": "High"},
+        ],
+    ),
+    MessageField.model_construct(
+        key="notes",
+        label="Additional context (optional)",
+        type="textarea",
+        required=False,
+        placeholder="Any other details that would help planning...",
+    ),
+)
+
+
 class MockPlanner(Planner):
     """Deterministic mock planner for tests and demos."""
 
     def _build_intake_form(self, intent: str) -> Message:
-        return Message(
+        return Message.model_construct(
             role="assistant",
             type=MessageType.FORM,
             text=f"To plan for '{intent}', please share a few details.",
-            fields=[
-                MessageField(
-                    key="team_size",
-                    label="Team size",
-                    type="number",
-                    required=True,
-                    placeholder="e.g. 5",
-                ),
-                MessageField(
-                    key="priority",
-                    label="Overall priority",
-                    type="select",
-                    required=True,
-                    options=[
-                        {"id": "low", "label": "Low"},
-                        {"id": "medium", "label": "Medium"},
-                        {"id": "high", "label": "High"},
-                    ],
-                ),
-                MessageField(
-                    key="notes",
-                    label="Additional context (optional)",
-                    type="textarea",
-                    required=False,
-                    placeholder="Any other details that would help planning...",
-                ),
-            ],
+            fields=list(_INTAKE_FORM_FIELDS),
         )
 
     def _build_plan(self, input: PlannerInput) -> Plan:
@@ -69,21 +74,22 @@ class MockPlanner(Planner):
         )
 
     def next(self, input: PlannerInput) -> PlannerOutput:
-        # If no user input yet, return form
-        if not any(msg.role == "user" for msg in input.conversation):
-            intake_form = self._build_intake_form(input.intent)
-            return {
-                "role": "assistant",
-                "type": "form",
-                "text": "I need a bit more information to set this up correctly.",
-                "fields": intake_form.fields,
-            }
+        # Once the user has replied, return the plan (plain loop: no generator frame per call)
+        for msg in input.conversation:
+            if msg.role == "user":
+                return {
+                    "role": "assistant",
+                    "type": "plan",
+                    "plan": self._build_plan(input),
+                }
 
-        # Else, return plan
+        # No user input yet, return form
+        intake_form = self._build_intake_form(input.intent)
         return {
             "role": "assistant",
-            "type": "plan",
-            "plan": self._build_plan(input),
+            "type": "form",
+            "text": "I need a bit more information to set this up correctly.",
+            "fields": intake_form.fields,
         }
 
 
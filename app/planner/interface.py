@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Literal, Optional, TypedDict, Union
+from typing import Any, Dict, List, Literal, Mapping, NotRequired, Optional, TypedDict, Union
 
 from pydantic import BaseModel, ConfigDict
 
@@ -11,7 +11,7 @@ class PlannerInput(BaseModel):
 
     tool_key: str
     intent: str
-    operation_registry: dict
+    operation_registry: Mapping[str, Any]
     pre_state: dict
     conversation: List[Message]
     validation_errors: Optional[List[ValidationError]] = None
@@ -28,6 +28,8 @@ class PlannerPlanOutput(TypedDict):
     role: Literal["assistant"]
     type: Literal["plan"]
     plan: Plan
+    # The plan as plain data (Plan.model_dump() shape), when the planner already has it.
+    plan_dict: NotRequired[Dict[str, Any]]
 
 
 PlannerOutput = Union[PlannerFormOutput, PlannerPlanOutput]
@@ -40,4 +42,12 @@ class Planner(ABC):
     def next(self, input: PlannerInput) -> PlannerOutput:
         raise NotImplementedError
 
+    async def next_async(self, input: PlannerInput) -> PlannerOutput:
+        """Async form of next(), used by the orchestrator.
+
+        The default calls next() inline, which suits planners that do no I/O;
+        planners that call out over the network should override it.
+        """
+        return self.next(input)
+
 
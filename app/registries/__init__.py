@@ -0,0 +1,31 @@
+"""Operation registries, one JSON file per tool."""
+
+import functools
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
+
+
+REGISTRIES_DIR = Path(__file__).resolve().parent
+
+
+@functools.lru_cache(maxsize=64)
+def _load_registry_cached(path: str, mtime: float) -> Mapping[str, Any]:
+    # mtime is part of the key so an edited registry is re-read.
+    with open(path, "r", encoding="utf-8") as f:
+        return MappingProxyType(json.load(f))
+
+
+def get_registry(tool_key: str) -> Mapping[str, Any]:
+    """Return the operation registry for a given tool.
+
+    The parsed registry is cached per file and shared by every caller, so it
+    is returned read-only.
+    """
+    registry_path = REGISTRIES_DIR / f"{tool_key}.json"
+    try:
+        mtime = registry_path.stat().st_mtime
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Registry not found for tool_key '{tool_key}' at {registry_path}") from None
+    return _load_registry_cached(str(registry_path), mtime)
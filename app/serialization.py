@@ -0,0 +1,16 @@
+"""Shared JSON serialization helpers for Vimani backend."""
+
+from typing import Any
+
+import orjson
+
+
+def orjson_default(value: Any) -> Any:
+    """Serialize pydantic models that orjson does not handle natively.
+
+    The model's own JSON serializer writes the bytes and orjson splices
+    them in as-is, so no intermediate dict is built.
+    """
+    if hasattr(value, "model_dump_json"):
+        return orjson.Fragment(value.model_dump_json())
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
@@ -0,0 +1,530 @@
+(() => {
+  const wsProtocol = window.location.protocol === "https:" ? "wss" : "ws";
+  const wsUrl = `${wsProtocol}://${window.location.host}/ws`;
+
+  const state = {
+    ws: null,
+    runId: null,
+    phase: "IDLE",
+    messages: [],
+    execEvents: [],
+    steps: {},
+    stepOrder: [],
+    paused: null,
+    final: null,
+  };
+
+  const elements = {
+    startCard: document.getElementById("start-card"),
+    intent: document.getElementById("intent-input"),
+    failStep: document.getElementById("fail-step-input"),
+    startBtn: document.getElementById("start-btn"),
+    chatMessages: document.getElementById("chat-messages"),
+    composer: document.getElementById("composer"),
+    userInput: document.getElementById("user-input"),
+    sendBtn: document.getElementById("send-btn"),
+    plannerForm: document.getElementById("planner-form"),
+    plannerHide: document.getElementById("planner-hide-btn"),
+    plannerSubmit: document.getElementById("planner-submit"),
+    plannerFields: document.getElementById("planner-fields"),
+    progressList: document.getElementById("progress-list"),
+    decisionCard: document.getElementById("decision-card"),
+    decisionButtons: document.querySelectorAll("#decision-card button[data-decision]"),
+    eventLog: document.getElementById("event-log"),
+    resultCard: document.getElementById("result-card"),
+    resultSummary: document.getElementById("result-summary"),
+    resultArchive: document.getElementById("result-archive"),
+  };
+
+  const statusIcons = {
+    PENDING: "…",
+    RUNNING: "⏳",
+    DONE: "✅",
+    FAILED: "❌",
+    PAUSED: "⏸",
+    SKIPPED: "⏭",
+  };
+
+  const logLines = [];
+
+  function appendLog(line) {
+    const timestamp = new Date().toLocaleTimeString();
+    logLines.push(`[${timestamp}] ${line}`);
+    while (logLines.length > 40) logLines.shift();
+    elements.eventLog.textContent = logLines.join("\n");
+    elements.eventLog.scrollTop = elements.eventLog.scrollHeight;
+  }
+
+  function togglePlannerForm(visible) {
+    elements.plannerForm.classList.toggle("hidden", !visible);
+  }
+
+  function toggleComposer(visible) {
+    elements.composer.classList.toggle("hidden", !visible);
+  }
+
+  function renderChat() {
+    const shouldShowComposer =
+      Boolean(state.runId) &&
+      state.phase === "PLANNING" &&
+      elements.plannerForm.classList.contains("hidden");
+
+    toggleComposer(shouldShowComposer);
+
+    elements.startCard.classList.toggle("hidden", Boolean(state.runId));
+  }
+
+  function appendBubble(msg) {
+    const container = elements.chatMessages;
+    const bubble = document.createElement("div");
+    bubble.className = `bubble ${msg.role === "user" ? "user" : "assistant"}`;
+    bubble.textContent = msg.text;
+    container.appendChild(bubble);
+    container.scrollTop = container.scrollHeight;
+  }
+
+  // Builds the step list once per plan; status changes only touch the icon.
+  function renderSteps() {
+    const list = elements.progressList;
+    list.innerHTML = "";
+    if (!state.stepOrder.length) {
+      const li = document.createElement("li");
+      li.className = "progress-item";
+      li.style.justifyContent = "center";
+      li.style.opacity = "0.65";
+      li.textContent = "Awaiting plan...";
+      list.appendChild(li);
+      return;
+    }
+    const fragment = document.createDocumentFragment();
+    state.stepOrder.forEach((id) => {
+      const step = state.steps[id];
+      const li = document.createElement("li");
+      li.className = "progress-item";
+      const icon = document.createElement("span");
+      icon.className = "status-icon";
+      icon.textContent = statusIcons[step.status] || "…";
+      const info = document.createElement("div");
+      info.style.flex = "1";
+      const title = document.createElement("strong");
+      title.textContent = step.id;
+      const meta = document.createElement("div");
+      meta.className = "meta";
+      meta.textContent = step.op;
+      info.appendChild(title);
+      info.appendChild(meta);
+      li.appendChild(icon);
+      li.appendChild(info);
+      step.liEl = li;
+      step.iconEl = icon;
+      fragment.appendChild(li);
+    });
+    list.appendChild(fragment);
+  }
+
+  function renderDecision() {
+    if (!state.paused) {
+      elements.decisionCard.classList.add("hidden");
+     return;
+    }
+
+    elements.decisionCard.classList.remove("hidden");
+
+    const error = state.paused.error;
+    if (error?.message) {
+      appendLog(`Paused: ${error.message}`);
+    }
+  }
+
+  function renderFinal() {
+    if (state.final) {
+      elements.resultCard.classList.remove("hidden");
+      const status = state.final.status || "SUCCESS";
+      const summary = state.final.summary || "Run completed.";
+      elements.resultSummary.textContent = `${summary} (status: ${status})`;
+      elements.resultArchive.textContent = state.final.archive_ref
+        ? `Run archived ✅  archive_ref: ${state.final.archive_ref}`
+        : "Run archived ✅";
+    } else {
+      elements.resultCard.classList.add("hidden");
+    }
+  }
+
+  function render() {
+    renderChat();
+    renderDecision();
+    renderFinal();
+  }
+
+  function addMessage(role, text) {
+    if (!text) return;
+    const msg = { role, text };
+    state.messages.push(msg);
+    appendBubble(msg);
+  }
+
+  function setPlanSteps(plan) {
+    if (!plan || !Array.isArray(plan.steps)) return;
+    state.steps = {};
+    state.stepOrder = [];
+    plan.steps.forEach((step, index) => {
+      const id = step.step_id || `step_${index + 1}`;
+      state.stepOrder.push(id);
+      state.steps[id] = {
+        id,
+        op: step.op_id || "operation",
+        status: "PENDING",
+        dependsOn: Array.isArray(step.depends_on) ? step.depends_on : [],
+        order: index,
+        liEl: null,
+        iconEl: null,
+      };
+    });
+    renderSteps();
+  }
+
+  function updateStepStatus(stepId, status) {
+    const step = state.steps[stepId];
+    if (!step || step.status === status) return;
+    step.status = status;
+    if (step.iconEl) step.iconEl.textContent = statusIcons[status] || "…";
+  }
+
+  function markDependentsSkipped(stepId) {
+    Object.values(state.steps).forEach((step) => {
+      if (step.dependsOn.includes(stepId)) {
+        updateStepStatus(step.id, "SKIPPED");
+      }
+    });
+  }
+
+  function normalizeMessageText(msg) {
+    if (!msg) return "";
+    return (
+      msg.text ||
+      msg.message ||
+      (typeof msg === "string" ? msg : JSON.stringify(msg, null, 2))
+    );
+  }
+
+  function normalizeExecEvent(msg) {
+    if (!msg) return null;
+    if (msg.event && msg.event.type) return msg.event;
+    if (msg.event && msg.event.event) return msg.event.event;
+    if (msg.type && msg.step_id !== undefined) return msg;
+    return msg.event || msg;
+  }
+
+  function renderDynamicForm(text, fields) {
+    const container = elements.plannerFields;
+    if (!container) return;
+    container.innerHTML = "";
+
+    const fieldsArray = Array.isArray(fields) ? fields : [];
+
+    fieldsArray.forEach((field) => {
+      if (!field || !field.key) return;
+
+      const wrapper = document.createElement("label");
+      wrapper.dataset.key = field.key;
+      wrapper.style.display = "flex";
+      wrapper.style.flexDirection = "column";
+      wrapper.style.gap = "6px";
+
+      const labelEl = document.createElement("span");
+      const requiredMark = field.required ? " *" : "";
+      labelEl.textContent = `${field.label || field.key}${requiredMark}`;
+      wrapper.appendChild(labelEl);
+
+      const fieldType = (field.type || "text").toLowerCase();
+      let inputEl;
+
+      if (fieldType === "textarea") {
+        inputEl = document.createElement("textarea");
+      } else if (fieldType === "select") {
+        inputEl = document.createElement("select");
+        const options = Array.isArray(field.options) ? field.options : [];
+        options.forEach((opt) => {
+          const optionEl = document.createElement("option");
+          let value;
+          let label;
+          if (typeof opt === "string") {
+            value = opt;
+            label = opt;
+          } else {
+            value = opt.value ?? opt.id ?? opt.label ?? "";
+            label = opt.label ?? String(value);
+          }
+          optionEl.value = value;
+          optionEl.textContent = label;
+          inputEl.appendChild(optionEl);
+        });
+      } else {
+        inputEl = document.createElement("input");
+        inputEl.type = fieldType === "number" ? "number" : "text";
+      }
+
+      inputEl.name = field.key;
+      if (field.placeholder) {
+        inputEl.placeholder = field.placeholder;
+      }
+      if (field.required) {
+        inputEl.required = true;
+      }
+
+      wrapper.appendChild(inputEl);
+      container.appendChild(wrapper);
+    });
+  }
+
+  function handlePlannerMessage(msg) {
+    if (msg.message && msg.message.type === "form") {
+      renderDynamicForm(msg.message.text, msg.message.fields);
+      togglePlannerForm(true);
+      return;
+    }
+
+    // If msg.message exists but we're not handling it as a form, log it to catch payload mismatches
+    if (msg.message && msg.message.type !== "form") {
+      console.log("Unhandled planner message:", msg.message);
+    }
+
+    const messageText = msg.message?.text || JSON.stringify(msg.message || msg, null, 2);
+    addMessage("assistant", messageText);
+  }
+
+  function sendUserMessage(text) {
+    const trimmed = (text || elements.userInput.value).trim();
+    if (!trimmed || !state.runId) return;
+    state.ws?.send(
+      JSON.stringify({
+        type: "USER_MESSAGE",
+        run_id: state.runId,
+        text: trimmed,
+      })
+    );
+    addMessage("user", trimmed);
+    elements.userInput.value = "";
+    togglePlannerForm(false);
+  }
+
+  function sendDecision(decision) {
+    if (!state.runId || !state.paused) return;
+    state.ws?.send(
+      JSON.stringify({
+        type: "STEP_DECISION",
+        run_id: state.runId,
+        step_id: state.paused.step_id,
+        decision,
+      })
+    );
+    appendLog(`Decision sent: ${decision}`);
+    if (decision === "SKIP_STEP") {
+      updateStepStatus(state.paused.step_id, "SKIPPED");
+    } else if (decision === "SKIP_DEPENDENTS") {
+      updateStepStatus(state.paused.step_id, "SKIPPED");
+      markDependentsSkipped(state.paused.step_id);
+    } else if (decision === "RETRY_STEP") {
+      updateStepStatus(state.paused.step_id, "PENDING");
+    }
+    state.paused = null;
+    state.phase = "EXECUTING";
+    render();
+  }
+
+  elements.decisionButtons.forEach((btn) => {
+    btn.addEventListener("click", () => sendDecision(btn.dataset.decision));
+  });
+
+  elements.sendBtn.addEventListener("click", () => sendUserMessage());
+  elements.userInput.addEventListener("keydown", (evt) => {
+    if (evt.key === "Enter" && evt.metaKey) {
+      sendUserMessage();
+    }
+  });
+
+  elements.startBtn.addEventListener("click", () => {
+    const intent = elements.intent.value.trim();
+    if (!intent) {
+      elements.intent.focus();
+      return;
+    }
+    const payload = {
+      type: "START_RUN",
+      tool_key: "clickup",
+      intent,
+      user_context: {},
+    };
+    const fail = elements.failStep.value.trim();
+    if (fail) {
+      payload.fail_on_step_id = fail;
+    }
+    state.phase = "PLANNING";
+    state.ws?.send(JSON.stringify(payload));
+    appendLog("START_RUN sent.");
+    elements.startBtn.disabled = true;
+    render();
+  });
+
+  elements.plannerSubmit.addEventListener("click", () => {
+    if (!state.runId || !elements.plannerFields) return;
+
+    const values = {};
+    const fieldWrappers = elements.plannerFields.querySelectorAll("label[data-key]");
+
+    fieldWrappers.forEach((wrapper) => {
+      const key = wrapper.dataset.key;
+      if (!key) return;
+      const inputEl = wrapper.querySelector("input, select, textarea");
+      if (!inputEl) return;
+
+      let value = inputEl.value;
+      if (inputEl.tagName === "INPUT" && inputEl.type === "number") {
+        value = value === "" ? null : Number(value);
+      }
+      values[key] = value;
+    });
+
+    state.ws?.send(
+      JSON.stringify({
+        type: "USER_MESSAGE",
+        run_id: state.runId,
+        text: "",
+        metadata: {
+          form_response: values,
+        },
+      })
+    );
+
+    togglePlannerForm(false);
+  });
+  elements.plannerHide.addEventListener("click", () => togglePlannerForm(false));
+
+  const ws = new WebSocket(wsUrl);
+  ws.binaryType = "arraybuffer";
+  state.ws = ws;
+
+  ws.addEventListener("open", () => appendLog("Connected to orchestrator."));
+  ws.addEventListener("close", () => appendLog("Connection closed."));
+
+  function applyExecEvent(eventPayload) {
+    state.execEvents.push(eventPayload);
+    if (eventPayload.type === "STEP_STARTED") {
+      updateStepStatus(eventPayload.step_id, "RUNNING");
+    } else if (eventPayload.type === "STEP_DONE") {
+      updateStepStatus(eventPayload.step_id, "DONE");
+    } else if (eventPayload.type === "STEP_FAILED") {
+      updateStepStatus(eventPayload.step_id, "FAILED");
+    }
+    appendLog(
+      `Event: ${eventPayload.type}${
+        eventPayload.step_id ? " (" + eventPayload.step_id + ")" : ""
+      }`
+    );
+  }
+
+  // Binary frame: uint8 tag (0x01), uint16 count, then per event a uint8
+  // event tag, uint16 index into the accepted plan's steps and a uint32
+  // length followed by that many bytes of JSON holding the event's
+  // message/output/error, if any (little-endian).
+  const binaryEventTypes = [null, "STEP_STARTED", "STEP_LOG", "STEP_DONE", "STEP_FAILED"];
+  const binaryDecoder = new TextDecoder();
+
+  function handleBinaryFrame(buffer) {
+    const view = new DataView(buffer);
+    if (view.getUint8(0) !== 0x01) return;
+    const count = view.getUint16(1, true);
+    let offset = 3;
+    for (let i = 0; i < count; i += 1) {
+      const length = view.getUint32(offset + 3, true);
+      const eventPayload = length
+        ? JSON.parse(binaryDecoder.decode(new Uint8Array(buffer, offset + 7, length)))
+        : {};
+      eventPayload.type = binaryEventTypes[view.getUint8(offset)];
+      eventPayload.step_id = state.stepOrder[view.getUint16(offset + 1, true)];
+      applyExecEvent(eventPayload);
+      offset += 7 + length;
+    }
+  }
+
+  function handleMessage(msg) {
+    switch (msg.type) {
+      case "RUN_CREATED":
+        state.runId = msg.run_id;
+        state.phase = "PLANNING";
+        appendLog("Run created: " + state.runId);
+        render();
+        break;
+      case "PLANNER_MESSAGE":
+        handlePlannerMessage(msg);
+        break;
+      case "PLAN_ACCEPTED":
+        if (msg.plan) setPlanSteps(msg.plan);
+        state.phase = "EXECUTING";
+        appendLog("Plan accepted.");
+        render();
+        break;
+      case "EXEC_EVENT": {
+        const eventPayload = normalizeExecEvent(msg);
+        if (!eventPayload || eventPayload.type === "RUN_SUMMARY") break;
+        applyExecEvent(eventPayload);
+        break;
+      }
+      case "EXEC_EVENT_BATCH":
+        (msg.events || []).forEach(handleMessage);
+        break;
+      case "NEED_STEP_DECISION":
+        state.phase = "PAUSED";
+        state.paused = { step_id: msg.step_id, error: msg.error };
+        updateStepStatus(msg.step_id, "PAUSED");
+        appendLog("Awaiting decision for " + msg.step_id);
+        render();
+        break;
+      case "RUN_DONE":
+        state.phase = "DONE";
+        state.paused = null;
+        state.final = {
+          status: msg.status || msg.result?.status,
+          summary: msg.summary || "Run completed.",
+          archive_ref: msg.archive_ref || msg.result?.archive_ref,
+        };
+        elements.startBtn.disabled = false;
+        toggleComposer(false);
+        togglePlannerForm(false);
+        appendLog("Run completed.");
+        render();
+        break;
+      case "RUN_ERROR":
+        state.phase = "DONE";
+        state.paused = null;
+        const errText = msg.error?.message || "Unknown error.";
+        addMessage("assistant", "Something went wrong: " + errText);
+        appendLog("Error: " + errText);
+        render();
+        break;
+      case "PING":
+        break;
+      case "PLAN_INVALID":
+        appendLog("Plan invalid: " + JSON.stringify(msg.errors || []));
+        break;
+      default:
+        appendLog("Event: " + msg.type);
+    }
+  }
+
+  ws.addEventListener("message", (event) => {
+    if (event.data instanceof ArrayBuffer) {
+      handleBinaryFrame(event.data);
+      return;
+    }
+    const msg = JSON.parse(event.data);
+    if (msg.type === "BATCH") {
+      msg.events.forEach(handleMessage);
+      return;
+    }
+    handleMessage(msg);
+  });
+
+  renderSteps();
+  render();
+})();
@@ -13,20 +13,8 @@ async def main():
 
     orch = OrchestratorService(planner=planner, executor=executor, archivist=archivist)
 
-    # ---- fake UI: send events to console ----
-    async def send_event(payload: dict):
-        print("\nEVENT:", payload)
-
-    # ---- fake UI: provide planner answers ----
-    async def wait_for_user_message(run_id: str):
-        return Message(
-            role="user",
-            type=MessageType.TEXT,
-            text="team_size=8; workstreams=Product, Ops, Sales",
-        )
-
     # ---- fake UI: decide what to do on step failure (interactive) ----
-    async def wait_for_step_decision(run_id: str, step_id: str):
+    async def ask_step_decision(run_id: str, step_id: str):
         def ask():
             print("\n--- STEP FAILED ---")
             print(f"run_id={run_id} step_id={step_id}")
@@ -37,13 +25,25 @@ async def main():
         if choice not in {"RETRY_STEP", "SKIP_STEP", "SKIP_DEPENDENTS", "ABORT_RUN", "REPLAN"}:
             choice = "RETRY_STEP"
 
-        return {
-            "type": "STEP_DECISION",
-            "run_id": run_id,
-            "step_id": step_id,
-            "decision": choice,
-            "notes": "manual decision from terminal",
-        }
+        orch.submit_step_decision(run_id, step_id, choice)
+
+    decision_tasks = set()
+
+    # ---- fake UI: send events to console ----
+    def send_event(payload: dict) -> None:
+        print("\nEVENT:", payload)
+        if payload.get("type") == "NEED_STEP_DECISION":
+            task = asyncio.create_task(ask_step_decision(payload["run_id"], payload["step_id"]))
+            decision_tasks.add(task)
+            task.add_done_callback(decision_tasks.discard)
+
+    # ---- fake UI: provide planner answers ----
+    async def wait_for_user_message():
+        return Message(
+            role="user",
+            type=MessageType.TEXT,
+            text="team_size=8; workstreams=Product, Ops, Sales",
+        )
 
     result = await orch.start_run(
         tool_key="clickup",
@@ -51,7 +51,6 @@ async def main():
         user_context={"demo_user": True, "fail_on_step_id": "S2"},
         send_event=send_event,
         wait_for_user_message=wait_for_user_message,
-        wait_for_step_decision=wait_for_step_decision,
     )
 
     print("\nFINAL RESULT:\n", result)
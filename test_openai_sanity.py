@@ -1,4 +1,7 @@
 import os
+import statistics
+import sys
+import time
 
 from openai import OpenAI
 
@@ -8,35 +11,37 @@ def main() -> None:
     One-off sanity check script for OpenAI connectivity.
 
     - Reads OPENAI_API_KEY from the environment
-    - Makes a single OpenAI Responses API call
-    - Prints the raw text response
+    - Makes a single OpenAI Responses API call (or N calls: ``python test_openai_sanity.py 10``)
+    - Prints the text response, and the p50 call latency when run more than once
     """
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("ERROR: OPENAI_API_KEY is not set in the environment.")
         return
 
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 1
     client = OpenAI(api_key=api_key)
 
     print("Calling OpenAI Responses API...")
-    response = client.responses.create(
-        model=os.getenv("VIMANI_PLANNER_MODEL", "gpt-4.1-mini"),
-        input="Say a short hello message to confirm connectivity.",
-        response_format={"type": "text"},
-    )
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = client.responses.create(
+            model=os.getenv("VIMANI_PLANNER_MODEL", "gpt-4.1-mini"),
+            input="Say a short hello message to confirm connectivity.",
+        )
+        latencies.append(time.perf_counter() - started)
 
     try:
-        text = response.output[0].content[0].text  # type: ignore[attr-defined]
         print("OpenAI response text:")
-        print(text.value)
+        print(response.output_text)
     except Exception as exc:  # pragma: no cover - defensive
         print("ERROR: Unexpected response shape from OpenAI:", repr(exc))
         print("Full response object:", response)
 
+    if runs > 1:
+        print(f"p50 latency over {runs} calls: {statistics.median(latencies) * 1000:.0f} ms")
+
 
 if __name__ == "__main__":
     main()
-
-
-
-